@@ -0,0 +1,44 @@
+"""store sha256 digest of refresh tokens with a unique index
+
+Revision ID: b7d2f41c9a3e
+Revises: e569e5ca7e89
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2f41c9a3e'
+down_revision: Union[str, Sequence[str], None] = 'e569e5ca7e89'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sessions', sa.Column('refresh_token_hash', sa.String(length=64), nullable=True))
+    # Backfill with the same digest JWTUtils.hash_token produces (hex sha256 of the utf-8 token)
+    op.execute(
+        "UPDATE sessions SET refresh_token_hash = encode(sha256(convert_to(refresh_token, 'UTF8')), 'hex')"
+    )
+    # Tokens issued in the same second used to be identical; keep one row per digest
+    op.execute(
+        "DELETE FROM sessions a USING sessions b "
+        "WHERE a.refresh_token_hash = b.refresh_token_hash AND a.ctid < b.ctid"
+    )
+    op.alter_column('sessions', 'refresh_token_hash', existing_type=sa.String(length=64), nullable=False)
+    op.create_index(op.f('ix_sessions_refresh_token_hash'), 'sessions', ['refresh_token_hash'], unique=True)
+    op.drop_column('sessions', 'refresh_token')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Raw tokens cannot be recovered from their digests, so existing sessions are dropped
+    op.execute("DELETE FROM sessions")
+    op.add_column('sessions', sa.Column('refresh_token', sa.String(length=255), nullable=False))
+    op.drop_index(op.f('ix_sessions_refresh_token_hash'), table_name='sessions')
+    op.drop_column('sessions', 'refresh_token_hash')
@@ -1,10 +1,108 @@
+from collections.abc import AsyncIterable, AsyncIterator, Mapping
+from datetime import datetime
+from functools import lru_cache
+from json.encoder import encode_basestring
 from typing import Any
-from fastapi.responses import JSONResponse
-from app.advices.response import (
-    ApiErrorSchema,
-    SuccesResponseSchema,
-    ErrorResponseSchema
-)
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+
+
+# One TypeAdapter per payload type; building one compiles a serializer, so it is done once
+_payload_adapters: dict[type, TypeAdapter] = {}
+
+
+def dump_payload(data: Any) -> bytes:
+    """Serialise `data` to JSON bytes with the cached adapter for its type."""
+    data_type = type(data)
+    adapter = _payload_adapters.get(data_type)
+    if adapter is None:
+        adapter = _payload_adapters.setdefault(data_type, TypeAdapter(data_type))
+    return adapter.dump_json(data)
+
+
+def _json_string(value: str) -> bytes:
+    """JSON string literal for `value`; non-ASCII stays UTF-8, as JSONResponse writes it."""
+    return encode_basestring(value).encode("utf-8")
+
+
+def _local_date_time() -> bytes:
+    # same value as the schemas' local_date_time; ISO 8601 needs no escaping
+    return (datetime.utcnow().isoformat() + "Z").encode("ascii")
+
+
+class EnvelopeResponse(Response):
+    """
+    Success envelope (see SuccesResponseSchema) serialised straight to bytes.
+    The payload is dumped once by pydantic-core and spliced into the envelope,
+    instead of going model -> dict via model_dump and dict -> str via json.dumps.
+    """
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        data: Any = None,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        super().__init__(content=data, status_code=status_code, headers=headers)
+
+    def render(self, content: Any) -> bytes:
+        return b"".join((
+            b'{"local_date_time":"', _local_date_time(),
+            b'","data":', dump_payload(content),
+            b',"api_error":null}',
+        ))
+
+
+class ErrorTemplate:
+    """
+    Error envelope (see ErrorResponseSchema) for one status code and message,
+    serialised once up front. Rendering splices in the timestamp and the errors
+    map only, so rejected requests skip pydantic and json.dumps entirely.
+    """
+    __slots__ = ("status_code", "_middle", "_detail_middle")
+
+    def __init__(self, status_code: int, message: str) -> None:
+        self.status_code = status_code
+        self._middle = (
+            b'","data":null,"api_error":{"status_code":' + str(status_code).encode("ascii")
+            + b',"message":' + _json_string(message) + b',"errors":'
+        )
+        self._detail_middle = self._middle + b'{"detail":'
+
+    def render(self, errors: Mapping[str, str] | None = None) -> bytes:
+        if errors is None:
+            encoded = b"null"
+        else:
+            encoded = b"{" + b",".join(
+                _json_string(key) + b":" + _json_string(value) for key, value in errors.items()
+            ) + b"}"
+        return b"".join((b'{"local_date_time":"', _local_date_time(), self._middle, encoded, b"}}"))
+
+    def response(
+        self,
+        errors: Mapping[str, str] | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> Response:
+        return Response(
+            content=self.render(errors),
+            status_code=self.status_code,
+            headers=headers,
+            media_type="application/json",
+        )
+
+    def detail_response(self, detail: str, headers: Mapping[str, str] | None = None) -> Response:
+        """Response whose errors are {"detail": detail}, the shape most handlers use."""
+        body = b"".join((
+            b'{"local_date_time":"', _local_date_time(), self._detail_middle, _json_string(detail), b"}}}",
+        ))
+        return Response(content=body, status_code=self.status_code, headers=headers, media_type="application/json")
+
+
+@lru_cache(maxsize=256)
+def error_template(status_code: int, message: str) -> ErrorTemplate:
+    """Shared template for ad-hoc error responses; bounded in case messages vary."""
+    return ErrorTemplate(status_code, message)
 
 
 class BaseResponse:
@@ -13,87 +111,100 @@ class BaseResponse:
     @staticmethod
     def succes_response(
         data: Any,
-        status_code: int = 200
-    )-> JSONResponse:
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+    )-> EnvelopeResponse:
         """Generate a successful Api Response"""
-        response_schema = SuccesResponseSchema(data=data)
-        return JSONResponse(
+        return EnvelopeResponse(data=data, status_code=status_code, headers=headers)
+    
+    @staticmethod
+    def ndjson_response(
+        rows: AsyncIterable[Any],
+        schema: type[BaseModel],
+        status_code: int = 200,
+        lines_per_chunk: int = 100,
+        headers: dict[str, str] | None = None,
+    ) -> StreamingResponse:
+        """
+        Stream rows as newline-delimited JSON, one `schema` object per line.
+        Lines are sent in chunks as rows arrive, so memory does not grow with the result set.
+        """
+        async def body() -> AsyncIterator[bytes]:
+            lines: list[bytes] = []
+            async for row in rows:
+                lines.append(schema.model_validate(row).model_dump_json().encode("utf-8") + b"\n")
+                if len(lines) >= lines_per_chunk:
+                    yield b"".join(lines)
+                    lines.clear()
+            if lines:
+                yield b"".join(lines)
+
+        return StreamingResponse(
+            body(),
             status_code=status_code,
-            content=response_schema.model_dump(mode="json")
+            media_type="application/x-ndjson",
+            headers=headers,
         )
-    
+
     @staticmethod
     def error_response(
         status_code: int,
         message: str,
         errors: dict[str, str] | None = None
-    ) -> JSONResponse:
+    ) -> Response:
         """Generate an error Api Response"""
-        api_error = ApiErrorSchema(
-            status_code=status_code,
-            message=message,
-            errors=errors
-        )
-        response_schema = ErrorResponseSchema(api_error=api_error)
-        return JSONResponse(
-            status_code=status_code,
-            content=response_schema.model_dump(mode="json")
-        )
+        return error_template(status_code, message).response(errors)
     
     @staticmethod
     def created_response(
         data: Any = None
-    ) -> JSONResponse:
+    ) -> EnvelopeResponse:
         """Generate a 201 Created Api Response"""
-        response = SuccesResponseSchema(data=data)
-        return JSONResponse(
-            status_code=201,
-            content=response.model_dump(mode="json")
-        )
+        return EnvelopeResponse(data=data, status_code=201)
     
     
     @staticmethod
-    def not_found_response(message: str = "Resource not found") -> JSONResponse:
+    def not_found_response(message: str = "Resource not found") -> Response:
         """
         Create a 404 Not Found response.
         :param message: Error message (default: "Resource not found")
-        :return: JSONResponse with 404 status code
+        :return: Response with 404 status code
         """
         return BaseResponse.error_response(message=message, status_code=404)
 
     @staticmethod
-    def unauthorized_response(message: str = "Unauthorized") -> JSONResponse:
+    def unauthorized_response(message: str = "Unauthorized") -> Response:
         """
         Create a 401 Unauthorized response.
         :param message: Error message (default: "Unauthorized")
-        :return: JSONResponse with 401 status code
+        :return: Response with 401 status code
         """
         return BaseResponse.error_response(message=message, status_code=401)
 
     @staticmethod
-    def forbidden_response(message: str = "Forbidden") -> JSONResponse:
+    def forbidden_response(message: str = "Forbidden") -> Response:
         """
         Create a 403 Forbidden response.
         :param message: Error message (default: "Forbidden")
-        :return: JSONResponse with 403 status code
+        :return: Response with 403 status code
         """
         return BaseResponse.error_response(message=message, status_code=403)
 
     @staticmethod
-    def conflict_response(message: str = "Resource already exists") -> JSONResponse:
+    def conflict_response(message: str = "Resource already exists") -> Response:
         """
         Create a 409 Conflict response.
         :param message: Error message (default: "Resource already exists")
-        :return: JSONResponse with 409 status code
+        :return: Response with 409 status code
         """
         return BaseResponse.error_response(message=message, status_code=409)
 
     @staticmethod
-    def validation_error_response(errors: dict) -> JSONResponse:
+    def validation_error_response(errors: dict) -> Response:
         """
         Create a 422 Validation Error response.
         :param errors: Validation error details
-        :return: JSONResponse with 422 status code
+        :return: Response with 422 status code
         """
         return BaseResponse.error_response(
             message="Validation Error", status_code=422, errors=errors
@@ -102,10 +213,10 @@ class BaseResponse:
     @staticmethod
     def internal_server_error_response(
         message: str = "Internal Server Error",
-    ) -> JSONResponse:
+    ) -> Response:
         """
         Create a 500 Internal Server Error response.
         :param message: Error message (default: "Internal Server Error")
-        :return: JSONResponse with 500 status code
+        :return: Response with 500 status code
         """
         return BaseResponse.error_response(message=message, status_code=500)
\ No newline at end of file
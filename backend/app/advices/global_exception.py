@@ -1,9 +1,9 @@
 import logging
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError, ResponseValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from app.advices.base_response import BaseResponse
+from app.advices.base_response import ErrorTemplate
 from app.exceptions.exceptions import (
     InvalidCredentialsException,
     InvalidOperationException,
@@ -14,10 +14,34 @@ from app.exceptions.exceptions import (
     VerificationCodeExpiredException,
     ValidationException,
     ConflictException,
+    ServiceUnavailableException,
+    NotModifiedException,
 )
 
 logger = logging.getLogger(__name__)
 
+# Error envelopes with a fixed status and message, serialised once at import
+RESOURCE_NOT_FOUND = ErrorTemplate(404, "Resource not found")
+INVALID_CREDENTIALS = ErrorTemplate(401, "Invalid credentials provided")
+UNAUTHORIZED_ACCESS = ErrorTemplate(403, "Unauthorized access")
+RESOURCE_ALREADY_EXISTS = ErrorTemplate(409, "Resource Already Exists")
+INVALID_OPERATION = ErrorTemplate(400, "Invalid Operation")
+ROUTE_NOT_FOUND = ErrorTemplate(404, "Route not found")
+REQUEST_VALIDATION_ERROR = ErrorTemplate(422, "Validation Error")
+RESPONSE_VALIDATION_ERROR = ErrorTemplate(500, "Response Validation Error")
+RESOURCE_NOT_VERIFIED = ErrorTemplate(403, "Resource Not Verified")
+VERIFICATION_CODE_EXPIRED = ErrorTemplate(400, "Verification Code Expired")
+CONFLICT = ErrorTemplate(409, "Conflict detected")
+VALIDATION_ERROR = ErrorTemplate(400, "Validation Error")
+SERVICE_UNAVAILABLE = ErrorTemplate(503, "Service Unavailable")
+INTERNAL_SERVER_ERROR = ErrorTemplate(500, "Internal Server Error")
+
+
+def _errors_by_field(errors) -> dict[str, str]:
+    """Last message per offending field, keyed by the final element of its location."""
+    return {str(error["loc"][-1]) if error["loc"] else "unknown": error["msg"] for error in errors}
+
+
 class GlobalExceptionHandler:
     """ Global exceptoion handler for Fast api applicationj"""
 
@@ -28,135 +52,90 @@ class GlobalExceptionHandler:
         @app.exception_handler(ResourceNotFoundException)
         async def handle_resource_not_found(
             _request: Request, exc: ResourceNotFoundException
-        ) -> JSONResponse:
-            return BaseResponse.error_response(
-                message="Resource not found",
-                status_code=404,
-                errors={"detail": exc.message}
-            )
+        ) -> Response:
+            return RESOURCE_NOT_FOUND.detail_response(exc.message)
         
         @app.exception_handler(InvalidCredentialsException)
         async def handle_invalid_credentials(
             _request: Request, exc: InvalidCredentialsException
-        ) -> JSONResponse:
-            return BaseResponse.error_response(
-                message="Invalid credentials provided",
-                status_code=401,
-                errors={"detail": exc.message}
-            )
+        ) -> Response:
+            return INVALID_CREDENTIALS.detail_response(exc.message)
         
         @app.exception_handler(UnauthorizedAccessException)
         async def handle_unauthorized_access(   
             _request: Request, exc: UnauthorizedAccessException
-        ) -> JSONResponse:
-            return BaseResponse.error_response(
-                message="Unauthorized access",
-                status_code=403,
-                errors={"detail": exc.message}
-            )
+        ) -> Response:
+            return UNAUTHORIZED_ACCESS.detail_response(exc.message)
         
 
         @app.exception_handler(ResourceAlreadyExistsException)
         async def handle_resource_already_exists(
             _request: Request, exc: ResourceAlreadyExistsException
-        ) -> JSONResponse:
-            return BaseResponse.error_response(
-                message="Resource Already Exists",
-                status_code=409,
-                errors={"detail": exc.message},
-            )
+        ) -> Response:
+            return RESOURCE_ALREADY_EXISTS.detail_response(exc.message)
 
         @app.exception_handler(InvalidOperationException)
         async def handle_invalid_operation(
             _request: Request, exc: InvalidOperationException
-        ) -> JSONResponse:
-            return BaseResponse.error_response(
-                message="Invalid Operation",
-                status_code=400,
-                errors={"detail": exc.message},
-            )
+        ) -> Response:
+            return INVALID_OPERATION.detail_response(exc.message)
 
         @app.exception_handler(404)
         async def not_found_handler(
             request: Request, _exc: StarletteHTTPException
-        ) -> JSONResponse:
-            return BaseResponse.error_response(
-                message="Route not found",
-                status_code=404,
-                errors={"path": str(request.url.path), "method": request.method},
-            )
+        ) -> Response:
+            return ROUTE_NOT_FOUND.response({"path": request.url.path, "method": request.method})
 
         @app.exception_handler(RequestValidationError)
         async def validation_exception_handler(
             _request: Request, exc: RequestValidationError
-        ) -> JSONResponse:
-            error_dict = {}
-            for error in exc.errors():
-                field = error["loc"][-1] if error["loc"] else "unknown"
-                error_dict[str(field)] = error["msg"]
-
-            return BaseResponse.validation_error_response(error_dict)
+        ) -> Response:
+            return REQUEST_VALIDATION_ERROR.response(_errors_by_field(exc.errors()))
 
         @app.exception_handler(ResponseValidationError)
         async def response_validation_exception_handler(
             _request: Request, exc: ResponseValidationError
-        ) -> JSONResponse:
-            error_dict = {}
-            for error in exc.errors():
-                field = error["loc"][-1] if error["loc"] else "unknown"
-                error_dict[str(field)] = error["msg"]
-
-            return BaseResponse.error_response(
-                message="Response Validation Error",
-                status_code=500,
-                errors=error_dict,
-            )
+        ) -> Response:
+            return RESPONSE_VALIDATION_ERROR.response(_errors_by_field(exc.errors()))
 
         @app.exception_handler(ResourceNotVerifiedException)
         async def handle_resource_not_verified(
             _request: Request, exc: ResourceNotVerifiedException
-        ) -> JSONResponse:
-            return BaseResponse.error_response(
-                message="Resource Not Verified",
-                status_code=403,
-                errors={"detail": exc.message},
-            )
+        ) -> Response:
+            return RESOURCE_NOT_VERIFIED.detail_response(exc.message)
 
         @app.exception_handler(VerificationCodeExpiredException)
         async def handle_verification_code_expired(
             _request: Request, exc: VerificationCodeExpiredException
-        ) -> JSONResponse:
-            return BaseResponse.error_response(
-                message="Verification Code Expired",
-                status_code=400,
-                errors={"detail": exc.message},
-            )
+        ) -> Response:
+            return VERIFICATION_CODE_EXPIRED.detail_response(exc.message)
 
         @app.exception_handler(ConflictException)
         async def handle_conflict_exception(
             _request: Request, exc: ConflictException
-        ) -> JSONResponse:
-            return BaseResponse.error_response(
-                message="Conflict detected",
-                status_code=409,
-                errors={"detail": exc.message},
-            )
+        ) -> Response:
+            return CONFLICT.detail_response(exc.message)
 
         @app.exception_handler(ValidationException)
         async def handle_validation_exception(
             _request: Request, exc: ValidationException
-        ) -> JSONResponse:
-            return BaseResponse.error_response(
-                message="Validation Error",
-                status_code=400,
-                errors={"detail": exc.message}
-            )
+        ) -> Response:
+            return VALIDATION_ERROR.detail_response(exc.message)
+
+        @app.exception_handler(ServiceUnavailableException)
+        async def handle_service_unavailable(
+            _request: Request, exc: ServiceUnavailableException
+        ) -> Response:
+            return SERVICE_UNAVAILABLE.detail_response(exc.message, headers={"Retry-After": "1"})
+
+        @app.exception_handler(NotModifiedException)
+        async def handle_not_modified(
+            _request: Request, exc: NotModifiedException
+        ) -> Response:
+            # no body; the validators and caching policy go out as on the full response
+            return Response(status_code=304, headers=exc.headers)
 
         @app.exception_handler(Exception)
-        async def handle_exception(_request: Request, exc: Exception) -> JSONResponse:
+        async def handle_exception(_request: Request, exc: Exception) -> Response:
             logger.error(f"Unexpected error occurred: {exc}")
-            return BaseResponse.error_response(
-                message="Internal Server Error",
-                status_code=500,
-                errors={"detail": str(exc)},
-            )      
\ No newline at end of file
+            return INTERNAL_SERVER_ERROR.detail_response(str(exc))      
\ No newline at end of file
@@ -1,32 +1,122 @@
+import json
 from abc import ABC
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from typing import Any, TypeVar
 from fastapi import Depends
-from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import Row, RowMapping, delete, func, or_, select
+from sqlalchemy.orm import DeclarativeBase, make_transient_to_detached
+from sqlalchemy import ColumnElement, inspect, Row, RowMapping, delete, func, insert, or_, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.db_connection import get_async_session
+from app.db.db_connection import READ_YOUR_WRITES_KEY, get_async_session
+from app.db.unit_of_work import BATCH_DEPTH_KEY, call_after_commit
+from app.config.pagination import CountStrategy, decode_cursor, encode_cursor
+from app.config.cache import CacheBackend, IdentityCache, LRUCache
+from app.config.settings import settings
+from app.exceptions.exceptions import InvalidOperationException
 
 T = TypeVar("T", bound=DeclarativeBase)
 
+# Exact counts shared by every repository, keyed by table and compiled filter
+count_cache: LRUCache[tuple[str, str, str], int] = LRUCache(
+    maxsize=settings.count_cache_size, ttl=settings.count_cache_ttl_seconds
+)
+# Per-table identity caches, shared by every repository instance in the process
+identity_caches: dict[str, IdentityCache] = {}
+
 class BaseRepository[T](ABC):
     """ Base repository class for all repositories """
     model: type[T]
+    cache_ttl: float | None = None              # seconds; set to cache get_by_id results for this model
+    cache_backend: CacheBackend | None = None   # optional shared store behind the in-process cache
+    cache_exclude: tuple[str, ...] = ()         # columns never cached (credentials); reloaded on a cache hit
     
     # a constructor to initialize the session
     def __init__(self, session: AsyncSession = Depends(get_async_session)):
         self.session = session
 
-    async def create(self, commit: bool = True, **kwargs)->T:              # **kwargs: keyword arguments used to pass any data 
+    async def create(self, commit: bool = False, **kwargs)->T:              # **kwargs: keyword arguments used to pass any data 
         data = self.model(**kwargs)
         self.session.add(data)
         if commit:
             await self.session.commit()
             await self.session.refresh(data)
+        else:
+            await self._flush()
         return data
 
+    async def _flush(self) -> None:
+        """Send pending ORM changes now, unless a UnitOfWork.batch() is collecting them."""
+        if not self.session.info.get(BATCH_DEPTH_KEY):
+            await self.session.flush()
+
     async def get_by_id(self, id: int) -> T | None:
-        return await self.session.get(self.model, id)
+        cache = self._identity_cache()
+        if cache is None:
+            return await self.session.get(self.model, id)
+
+        # an instance already in this session may carry unflushed changes, it wins over the cache
+        instance = self.session.identity_map.get(self.session.sync_session.identity_key(self.model, id))
+        if instance is not None:
+            return instance
+
+        # sessions explicitly pinned to the primary (read-your-writes) skip cached copies
+        values = None if self.session.info.get(READ_YOUR_WRITES_KEY) else await cache.get(str(id))
+        if values is not None:
+            instance = self.model(**values)
+            make_transient_to_detached(instance)
+            instance = await self.session.merge(instance, load=False)
+            if self.cache_exclude:
+                # an unloaded attribute would lazy-load on access, which AsyncSession cannot do
+                await self.session.refresh(instance, attribute_names=list(self.cache_exclude))
+            return instance
+
+        instance = await self.session.get(self.model, id)
+        if instance is not None:
+            values = self._column_values(instance)
+            if values is not None:
+                await cache.set(str(id), values)
+        return instance
+
+    @classmethod
+    def _identity_cache(cls) -> IdentityCache | None:
+        if cls.cache_ttl is None or settings.identity_cache_size <= 0:
+            return None
+        name = cls.model.__tablename__
+        cache = identity_caches.get(name)
+        if cache is None:
+            cache = identity_caches[name] = IdentityCache(
+                name, maxsize=settings.identity_cache_size, ttl=cls.cache_ttl, backend=cls.cache_backend
+            )
+        return cache
+
+    @classmethod
+    def _column_values(cls, instance: T) -> dict[str, Any] | None:
+        """Loaded column attributes of an instance minus `cache_exclude`, or None if any are expired or deferred."""
+        state = inspect(instance)
+        keys = [attr.key for attr in state.mapper.column_attrs if attr.key not in cls.cache_exclude]
+        if any(key not in state.dict for key in keys):
+            return None
+        return {key: state.dict[key] for key in keys}
+
+    async def _invalidate(self, id: Any | None = None) -> None:
+        """
+        Drop one cached row, or the whole table's cache after a set-based write.
+        Inside an open transaction it is dropped again after commit, so a concurrent
+        reader cannot re-cache the pre-commit row for the rest of the TTL.
+        """
+        cache = self._identity_cache()
+        if cache is None:
+            return
+
+        async def evict() -> None:
+            if id is None:
+                await cache.clear()
+            else:
+                await cache.delete(str(id))
+
+        await evict()
+        if self.session.in_transaction():
+            call_after_commit(self.session, evict)
 
     async def get_all_paginated(
         self,
@@ -35,29 +125,26 @@ class BaseRepository[T](ABC):
         query: str | None = None,
         order_by: str | None = None,
         descending: bool = True,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
     ) -> dict[str, Any]:
         stmt = select(self.model)
-        count_stmt = select(func.count()).select_from(self.model)
-
-        if query:
-            filters = []
-            for column in self.modle.__table__.column:
-                if(
-                    hasattr(column.type, "python type")
-                    and column.type.python_type is str
-                ):
-                    filters.append(column.ilike(f"%{query}%"))
-            if filters:
-                stmt = stmt.where(or_(*filters))
-                count_stmt = count_stmt.where(or_(*filters))    
+        criteria = []
+
+        search = self._search_criteria(query)
+        if search is not None:
+            stmt = stmt.where(search)
+            criteria.append(search)
+
+        # Best matches first when searching, then the requested order
+        if search is not None:
+            stmt = stmt.order_by(self._search_rank(query).desc())
 
         # Apply order if specified
         if order_by and hasattr(self.model, order_by):
             column = getattr(self.model, order_by)
             stmt = stmt.order_by(column.desc() if descending else column.asc())
 
-        total_query = await self.session.execute(count_stmt)
-        total = total_query.scalar_one()
+        total, total_strategy = await self.count(criteria, count_strategy)
 
         item_query = await self.session.execute(stmt.offset(offset).limit(limit))
         items = item_query.scalars().all()
@@ -66,17 +153,187 @@ class BaseRepository[T](ABC):
 
         return {
             "total": total,
+            "total_strategy": total_strategy,
             self.model.__name__: items,
             "current_page": (offset // limit) + 1,
             "limit": limit,
             "total_pages": total_pages,
         }
 
+    async def count(
+        self,
+        criteria: Sequence[ColumnElement[bool]] = (),
+        strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> tuple[int, CountStrategy]:
+        """
+        Row count under the given strategy. Returns the count and the strategy that
+        actually produced it (an estimate falls back to exact when the planner has no statistics).
+        """
+        if strategy == CountStrategy.ESTIMATE:
+            estimate = await self._estimate_count(criteria)
+            if estimate is not None:
+                return estimate, CountStrategy.ESTIMATE
+            strategy = CountStrategy.EXACT
+
+        count_stmt = select(func.count()).select_from(self.model).where(*criteria)
+        if strategy == CountStrategy.CACHED:
+            compiled = count_stmt.compile(dialect=self.session.bind.dialect)
+            cache_key = (self.model.__tablename__, compiled.string, repr(sorted(compiled.params.items())))
+            total = count_cache.get(cache_key)
+            if total is None:
+                total = (await self.session.execute(count_stmt)).scalar_one()
+                count_cache.set(cache_key, total)
+            return total, CountStrategy.CACHED
+
+        return (await self.session.execute(count_stmt)).scalar_one(), CountStrategy.EXACT
+
+    async def _estimate_count(self, criteria: Sequence[ColumnElement[bool]]) -> int | None:
+        """Planner row estimate: pg_class.reltuples for the whole table, EXPLAIN for a filter."""
+        if not criteria:
+            result = await self.session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": self.model.__tablename__},
+            )
+            estimate = result.scalar_one_or_none()
+            # reltuples is -1 until the table has been vacuumed or analyzed
+            return estimate if estimate is not None and estimate >= 0 else None
+
+        rows_stmt = select(self.model.id).where(*criteria)
+        connection = await self.session.connection()
+        compiled = rows_stmt.compile(dialect=connection.dialect)
+        params = tuple(compiled.params[name] for name in compiled.positiontup or ())
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled.string}", params)
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _search_columns(self) -> list[ColumnElement[str]]:
+        """Columns named in the model's `__searchable__`, each expected to carry a gin_trgm_ops index."""
+        names = getattr(self.model, "__searchable__", ())
+        if not names:
+            raise InvalidOperationException(f"{self.model.__name__} does not declare searchable columns")
+        return [getattr(self.model, name) for name in names]
+
+    def _search_criteria(self, query: str | None) -> ColumnElement[bool] | None:
+        """
+        OR of ILIKE matches across the model's `__searchable__` columns. With pg_trgm
+        GIN indexes on those columns Postgres answers `ILIKE '%q%'` from the index
+        (bitmap scan) instead of reading every row.
+        """
+        if not query:
+            return None
+        # LIKE wildcards in user input are matched literally
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return or_(*(column.ilike(pattern, escape="\\") for column in self._search_columns()))
+
+    def _search_rank(self, query: str) -> ColumnElement[float]:
+        """Best trigram similarity of `query` across the searchable columns, higher is closer."""
+        columns = self._search_columns()
+        if len(columns) == 1:
+            return func.similarity(columns[0], query)
+        return func.greatest(*(func.similarity(column, query) for column in columns))
+
+    async def get_all_keyset(
+        self,
+        limit: int = 10,
+        cursor: str | None = None,
+        query: str | None = None,
+        order_by: str | None = None,
+        descending: bool = True,
+        filters: Sequence[ColumnElement[bool]] = (),
+        count_strategy: CountStrategy | None = None,
+    ) -> dict[str, Any]:
+        """
+        Keyset (cursor) pagination: seeks past the boundary row with a row-value
+        predicate `(order_key, id) < (:key, :id)` instead of OFFSET, so every page
+        costs the same on an index over (order_key, id). `order_by` should name a
+        non-null column. A search `query` filters but does not rank, since rows must
+        stay in seek-key order. Returns opaque `next_cursor`/`prev_cursor` strings;
+        `total` is only computed when a `count_strategy` is given.
+        """
+        keys = [self.model.id]
+        if order_by and order_by != "id" and hasattr(self.model, order_by):
+            keys.insert(0, getattr(self.model, order_by))
+
+        criteria = list(filters)
+        search = self._search_criteria(query)
+        if search is not None:
+            criteria.append(search)
+
+        direction = "next"
+        stmt = select(self.model).where(*criteria)
+        if cursor:
+            values, direction = decode_cursor(cursor, keys)
+            # walking backwards scans in the opposite order and flips the page afterwards
+            scan_descending = descending if direction == "next" else not descending
+            boundary = tuple_(*keys) < tuple_(*values) if scan_descending else tuple_(*keys) > tuple_(*values)
+            stmt = stmt.where(boundary)
+        else:
+            scan_descending = descending
+        stmt = stmt.order_by(*[key.desc() if scan_descending else key.asc() for key in keys])
+
+        result = await self.session.execute(stmt.limit(limit + 1))
+        items = list(result.scalars().all())
+        has_more = len(items) > limit
+        items = items[:limit]
+        if direction == "prev":
+            items.reverse()
+
+        def boundary_cursor(item: T, to: str) -> str:
+            return encode_cursor([getattr(item, key.key) for key in keys], to)
+
+        has_next = has_more if direction == "next" else cursor is not None
+        has_prev = cursor is not None if direction == "next" else has_more
+
+        total, total_strategy = None, None
+        if count_strategy is not None:
+            total, total_strategy = await self.count(criteria, count_strategy)
+
+        return {
+            "total": total,
+            "total_strategy": total_strategy,
+            self.model.__name__: items,
+            "limit": limit,
+            "next_cursor": boundary_cursor(items[-1], "next") if items and has_next else None,
+            "prev_cursor": boundary_cursor(items[0], "prev") if items and has_prev else None,
+        }
+
     async def get_all(self) -> Sequence[Row[Any] | RowMapping | Any ]:
         stmt = select(self.model)
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def stream_all(self, batch_size: int | None = None) -> AsyncIterator[T]:
+        """Iterate the whole table without materialising it; see `stream_where`."""
+        async for item in self.stream_where(batch_size=batch_size):
+            yield item
+
+    async def stream_where(
+        self,
+        *criteria: ColumnElement[bool],
+        order_by: str | None = None,
+        descending: bool = False,
+        batch_size: int | None = None,
+    ) -> AsyncIterator[T]:
+        """
+        Yield matching rows from a server-side cursor, `batch_size` rows per fetch,
+        so memory stays flat however many rows match. The session's connection is
+        held until the iterator is exhausted or closed.
+        """
+        stmt = select(self.model).where(*criteria)
+        if order_by and hasattr(self.model, order_by):
+            column = getattr(self.model, order_by)
+            stmt = stmt.order_by(column.desc() if descending else column.asc())
+        stmt = stmt.execution_options(yield_per=batch_size or settings.stream_batch_size)
+
+        result = await self.session.stream_scalars(stmt)
+        try:
+            async for item in result:
+                yield item
+        finally:
+            await result.close()
+
     async def get_by_field(self, field: str, value :Any) -> T| None:
         if not hasattr(self.model, field):
             raise AttributeError(f"{self.model.__name__} has no field named {field}")
@@ -84,28 +341,146 @@ class BaseRepository[T](ABC):
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
            
-    async def update(self, id: Any, commit: bool = True, **kwargs) -> T | None:
-        record = await self.get_by_id(id)
-        if not record:
-            return None
-        for key, value in kwargs.items():
-            setattr(record, key, value)
+    async def update(self, id: Any, commit: bool = False, **kwargs) -> T | None:
+        """
+        UPDATE ... WHERE id = :id RETURNING * in one round trip, no prior SELECT.
+        Returns the updated model (server-side values such as updated_at included) or None if no row matched.
+        """
+        if not kwargs:
+            return await self.get_by_id(id)
+        stmt = (
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**kwargs)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.scalars(stmt)
+        record = result.one_or_none()
         if commit:
             await self.session.commit()
-            await self.session.refresh(record)
+        await self._invalidate(id)
         return record
 
     
-    async def delete(self, id: Any, commit: bool = True) -> bool:
-        record = await self.get_by_id(id)
-        if record:
-            await self.session.execute(delete(self.model).where(self.model.id == id))
-            if commit:
-                await self.session.commit()
-            return True
-        return False
+    async def delete(self, id: Any, commit: bool = False) -> bool:
+        """DELETE ... WHERE id = :id RETURNING id; True when a row was deleted."""
+        result = await self.session.execute(
+            delete(self.model).where(self.model.id == id).returning(self.model.id)
+        )
+        deleted = result.first() is not None
+        if commit:
+            await self.session.commit()
+        await self._invalidate(id)
+        return deleted
+
+    async def bulk_create(
+        self, rows: Sequence[dict[str, Any]], commit: bool = False, returning: bool = False
+    ) -> list[T] | int:
+        """
+        Insert many rows in one statement (executemany batched into multi-row INSERTs).
+        Returns the created models when `returning` is set, otherwise the number of rows.
+        """
+        if not rows:
+            return [] if returning else 0
+        if returning:
+            result = await self.session.scalars(insert(self.model).returning(self.model), rows)
+            created = list(result.all())
+        else:
+            await self.session.execute(insert(self.model), rows)
+            created = len(rows)
+        if commit:
+            await self.session.commit()
+        return created
+
+    async def bulk_upsert(
+        self,
+        rows: Sequence[dict[str, Any]],
+        index_elements: Sequence[str],
+        update_fields: Sequence[str] | None = None,
+        commit: bool = False,
+        returning: bool = False,
+    ) -> list[T] | int:
+        """
+        INSERT ... ON CONFLICT (index_elements) DO UPDATE for many rows in one statement.
+        `update_fields` defaults to every provided column outside the conflict target;
+        with nothing to update the conflict is ignored (DO NOTHING).
+        """
+        if not rows:
+            return [] if returning else 0
+        stmt = pg_insert(self.model)
+        if update_fields is None:
+            update_fields = [key for key in rows[0] if key not in index_elements]
+        if update_fields:
+            set_ = {field: stmt.excluded[field] for field in update_fields}
+            set_.update(self._onupdate_values(exclude=(*index_elements, *set_)))
+            stmt = stmt.on_conflict_do_update(index_elements=list(index_elements), set_=set_)
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(index_elements))
+        if returning:
+            # populate_existing refreshes rows already in the identity map with the upserted values
+            result = await self.session.scalars(
+                stmt.returning(self.model).execution_options(populate_existing=True), rows
+            )
+            upserted = list(result.all())
+        else:
+            await self.session.execute(stmt, rows)
+            upserted = len(rows)
+        if commit:
+            await self.session.commit()
+        await self._invalidate()
+        return upserted
+
+    @classmethod
+    def _onupdate_values(cls, exclude: Sequence[str] = ()) -> dict[str, Any]:
+        """
+        Column onupdate defaults (updated_at = now()) as explicit values.
+        ON CONFLICT DO UPDATE only sets what `set_` names, so they have to be spelled out there.
+        """
+        values: dict[str, Any] = {}
+        for column in cls.model.__table__.columns:
+            default = column.onupdate
+            if default is None or column.key in exclude:
+                continue
+            if default.is_callable:
+                values[column.key] = default.arg(None)
+            else:
+                values[column.key] = default.arg
+        return values
+
+    async def delete_where(self, *criteria: ColumnElement[bool], commit: bool = False) -> int:
+        """DELETE every row matching the criteria in one statement. Returns rows deleted."""
+        if not criteria:
+            raise ValueError("delete_where requires at least one criterion")
+        result = await self.session.execute(delete(self.model).where(*criteria))
+        if commit:
+            await self.session.commit()
+        await self._invalidate()
+        return result.rowcount
+
+    async def update_where(
+        self, *criteria: ColumnElement[bool], values: dict[str, Any], commit: bool = False, returning: bool = False
+    ) -> list[T] | int:
+        """
+        UPDATE every row matching the criteria in one statement.
+        Returns the updated models when `returning` is set, otherwise the number of rows.
+        """
+        if not criteria:
+            raise ValueError("update_where requires at least one criterion")
+        stmt = update(self.model).where(*criteria).values(**values)
+        if returning:
+            result = await self.session.scalars(
+                stmt.returning(self.model).execution_options(populate_existing=True)
+            )
+            updated = list(result.all())
+        else:
+            updated = (await self.session.execute(stmt)).rowcount
+        if commit:
+            await self.session.commit()
+        await self._invalidate()
+        return updated
 
     async def commit(self) -> None:
-        """Manually commit the session (use after batch operations)."""
+        """Commit the session outside a unit of work (scripts, background jobs)."""
         await self.session.commit()
     
\ No newline at end of file
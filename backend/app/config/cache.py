@@ -0,0 +1,126 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Protocol
+
+
+class LRUCache[K: Hashable, V]:
+    """ Bounded in-process LRU cache with optional per-entry expiry """
+
+    def __init__(self, maxsize: int, ttl: float | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl      # default lifetime in seconds, None means entries only leave through LRU
+        self._data: OrderedDict[K, tuple[V, float | None]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: K) -> V | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, expires_at: float | None = None) -> None:
+        """Store a value; `expires_at` is an absolute unix timestamp and overrides the default ttl."""
+        if self.maxsize <= 0:
+            return
+        if expires_at is None and self.ttl is not None:
+            expires_at = time.time() + self.ttl
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: K) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class CacheBackend(Protocol):
+    """ Shared store (e.g. Redis) behind the in-process identity cache; values are column dicts """
+
+    async def get(self, key: str) -> dict[str, Any] | None: ...
+
+    async def set(self, key: str, value: dict[str, Any], ttl: float) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+    async def clear(self, prefix: str) -> None: ...
+
+
+class IdentityCache:
+    """
+    Column values of one table's rows by primary key. Lookups hit the in-process
+    LRU first and fall back to the shared backend when one is configured.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, backend: CacheBackend | None = None) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.backend = backend
+        self.local: LRUCache[str, dict[str, Any]] = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.shared_hits = 0
+
+    def _shared_key(self, key: str) -> str:
+        return f"{self.name}:{key}"
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        value = self.local.get(key)
+        if value is None and self.backend is not None:
+            value = await self.backend.get(self._shared_key(key))
+            if value is not None:
+                self.shared_hits += 1
+                self.local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: dict[str, Any]) -> None:
+        self.local.set(key, value)
+        if self.backend is not None:
+            await self.backend.set(self._shared_key(key), value, self.ttl)
+
+    async def delete(self, key: str) -> None:
+        self.local.delete(key)
+        if self.backend is not None:
+            await self.backend.delete(self._shared_key(key))
+
+    async def clear(self) -> None:
+        self.local.clear()
+        if self.backend is not None:
+            await self.backend.clear(self._shared_key(""))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.local.stats(),
+            "ttl": self.ttl,
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "shared_hits": self.shared_hits,
+        }
@@ -0,0 +1,56 @@
+import base64
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from enum import StrEnum
+from typing import Any
+from sqlalchemy import ColumnElement
+from app.exceptions.exceptions import ValidationException
+
+
+class CountStrategy(StrEnum):
+    """ How a paginated listing computes `total` """
+    EXACT = "exact"         # count(*) over the filter
+    ESTIMATE = "estimate"   # planner estimate: pg_class.reltuples, or EXPLAIN rows when filtered
+    CACHED = "cached"       # exact count reused for a short TTL per model and filter
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def encode_cursor(keys: list[Any], direction: str) -> str:
+    """Opaque cursor for keyset pagination: the (order_key, id) of a boundary row plus the walk direction."""
+    payload = json.dumps({"k": keys, "d": direction}, default=_to_json, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: list[ColumnElement[Any]]) -> tuple[list[Any], str]:
+    """Decode a cursor back into typed key values for `columns` and its direction ("next" or "prev")."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        raw_keys, direction = payload["k"], payload["d"]
+        if direction not in ("next", "prev") or len(raw_keys) != len(columns):
+            raise ValueError("cursor does not match this listing")
+        return [_coerce(column, raw) for column, raw in zip(columns, raw_keys)], direction
+    except (ValueError, TypeError, KeyError, json.JSONDecodeError):
+        raise ValidationException("Invalid pagination cursor")
+
+
+def _coerce(column: ColumnElement[Any], raw: Any) -> Any:
+    if raw is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    if python_type is date:
+        return date.fromisoformat(raw)
+    if python_type is uuid.UUID:
+        return uuid.UUID(raw)
+    return python_type(raw)
@@ -2,6 +2,20 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     database_url: str
+    database_replica_urls: list[str] = []           # JSON list in the env; empty sends everything to the primary
+    database_replica_strategy: str = "round_robin"  # or "least_connections"
+
+    # Connection pool, per engine and per worker process: keep
+    # workers * engines * (pool_size + max_overflow) under Postgres max_connections
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0           # seconds to wait for a connection before failing
+    db_pool_recycle: int = 1800             # seconds before a connection is replaced, -1 never
+    db_pool_pre_ping: bool = True           # test connections on checkout, drops ones the server closed
+
+    # asyncpg prepared statements
+    db_prepared_statement_cache_size: int = 500     # prepared statements kept per connection
+    db_pgbouncer_mode: bool = False         # transaction pooling: no statement caching, unique statement names
     debug: bool = True
     
     # JWT Configuration
@@ -10,7 +24,46 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int
     refresh_token_expire_minutes: int
+    access_token_cache_size: int = 10_000   # verified access tokens kept in memory, 0 disables the cache
+
+    # Password hashing worker pool
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64     # queued + running jobs before requests fail fast with 503
+
+    # Password hashing algorithm and cost ("bcrypt" or "argon2id")
+    password_hash_algorithm: str = "bcrypt"
+    password_hash_target_ms: int = 250      # startup calibration target per hash, 0 keeps the configured cost;
+                                            # calibration only raises the cost above the configured one
+    password_hash_bcrypt_rounds: int = 12
+    password_hash_bcrypt_max_rounds: int = 15
+    password_hash_argon2_time_cost: int = 3
+    password_hash_argon2_max_time_cost: int = 10
+    password_hash_argon2_memory_kib: int = 65536
+    password_hash_argon2_parallelism: int = 1
+
+    # Paginated listings
+    count_cache_ttl_seconds: float = 30.0
+    count_cache_size: int = 1024
+    stream_batch_size: int = 500            # rows per server-side cursor fetch when streaming
+
+    # Identity cache for repositories that opt in with cache_ttl
+    identity_cache_size: int = 10_000       # rows kept per table, 0 disables caching
+
+    # Per-request SQL instrumentation
+    sql_instrumentation_sample_rate: float = 0.05   # share of requests timed, 0 disables, 1 times all
+    sql_slowest_statements: int = 3
+    sql_n_plus_one_threshold: int = 5       # identical statements in one request before warning
+    sql_recent_requests: int = 100          # sampled request reports kept for /internal/metrics/sql
+
+    # Response compression (zstd and brotli need the "compression" extra, gzip is always available)
+    compression_minimum_size: int = 1024    # bytes; smaller bodies go out uncompressed
+    compression_level: str = "default"      # "fast", "default", "best" or "off"
+    compression_route_levels: dict[str, str] = {    # path prefix -> level, longest prefix wins
+        "/api/v1/sessions/export": "fast",
+    }
 
+    # Internal metrics endpoints (open outside production when no token is set)
+    internal_metrics_token: str = ""
 
     supabase_access_key_id: str = ""
     supabase_access_key_secret: str = ""
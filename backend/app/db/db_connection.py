@@ -1,17 +1,112 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+import itertools
+import uuid
+from typing import Any
+from sqlalchemy import Select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 from collections.abc import AsyncGenerator
 from app.config.settings import settings
+from app.db.instrumentation import instrument_engine
+from app.db.pool import InstrumentedAsyncQueuePool
 
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-)
+def _connect_args() -> dict[str, Any]:
+    """asyncpg prepared-statement settings for a direct Postgres connection or for pgbouncer."""
+    if settings.db_pgbouncer_mode:
+        # a pooled server connection may belong to another client by the next statement,
+        # so nothing can be cached and names must never collide across clients
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return {
+        "statement_cache_size": settings.db_prepared_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+    }
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    created = create_async_engine(
+        url,
+        connect_args=_connect_args(),
+        echo=settings.debug,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    instrument_engine(created.sync_engine)
+    return created
+
+
+engine = _create_engine(settings.database_url)
+replica_engines = [_create_engine(url) for url in settings.database_replica_urls]
+
+# session.info keys used by RoutingSession
+USE_PRIMARY_KEY = "use_primary"         # set after the first primary statement, keeps the session there
+REPLICA_KEY = "replica"
+READ_YOUR_WRITES_KEY = "read_your_writes"   # explicit use_primary() pin: skip replicas and read caches
+
+
+class ReplicaSelector:
+    """ Picks the replica a session reads from: "round_robin" or "least_connections" """
+
+    def __init__(self, engines: list[AsyncEngine], strategy: str = "round_robin") -> None:
+        if strategy not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unsupported replica strategy: {strategy}")
+        self.engines = engines
+        self.strategy = strategy
+        self._cycle = itertools.cycle(engines)
+
+    def pick(self) -> Engine:
+        if self.strategy == "least_connections":
+            return min(self.engines, key=lambda e: e.sync_engine.pool.checkedout()).sync_engine
+        return next(self._cycle).sync_engine
+
+
+replica_selector = ReplicaSelector(replica_engines, settings.database_replica_strategy) if replica_engines else None
+
+
+class RoutingSession(Session):
+    """
+    Sends plain SELECTs to a read replica and everything else to the primary.
+    After its first primary statement (a write, flush, locking read or raw SQL) the
+    session stays on the primary, so reads later in the request see its own writes.
+    A session keeps one replica for all its reads.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if replica_selector is not None and self._reads_from_replica(clause):
+            replica = self.info.get(REPLICA_KEY)
+            if replica is None:
+                replica = self.info[REPLICA_KEY] = replica_selector.pick()
+            return replica
+        self.info[USE_PRIMARY_KEY] = True
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+    def _reads_from_replica(self, clause) -> bool:
+        return (
+            not self.info.get(USE_PRIMARY_KEY)
+            and not self._flushing
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+        )
+
+
+def use_primary(session: AsyncSession) -> None:
+    """Read-your-writes: send every statement of this session to the primary and bypass read caches."""
+    session.info[USE_PRIMARY_KEY] = True
+    session.info[READ_YOUR_WRITES_KEY] = True
+
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,   # connects the session factory to your Database Engine.
     class_=AsyncSession,   # creates asynchronous sessions
+    sync_session_class=RoutingSession,   # routes reads to replicas when any are configured
     expire_on_commit=False,   # prevents cleaning the data from variables after commit
 )
 
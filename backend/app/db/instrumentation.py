@@ -0,0 +1,71 @@
+import heapq
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Any
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config.settings import settings
+
+
+class QueryStats:
+    """ Statements issued while one request is being handled """
+
+    def __init__(self, slowest_kept: int = 3) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.hold_ms = 0.0      # time pooled connections were checked out, added by the pool on checkin
+        self.slowest_kept = slowest_kept
+        self.slowest: list[tuple[float, str]] = []   # min-heap of (ms, statement)
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        # SQLAlchemy renders binds as placeholders, so the text is already the statement's shape
+        self.shapes[statement] += 1
+        if len(self.slowest) < self.slowest_kept:
+            heapq.heappush(self.slowest, (elapsed_ms, statement))
+        elif elapsed_ms > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (elapsed_ms, statement))
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes run at least `threshold` times: suspected N+1 queries."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def report(self, threshold: int) -> dict[str, Any]:
+        return {
+            "queries": self.count,
+            "db_ms": round(self.total_ms, 3),
+            "connection_hold_ms": round(self.hold_ms, 3),
+            "slowest": [
+                {"ms": round(ms, 3), "statement": statement}
+                for ms, statement in sorted(self.slowest, reverse=True)
+            ],
+            "n_plus_one": [{"count": n, "statement": shape} for shape, n in self.repeated(threshold)],
+        }
+
+
+# Collector of the request being handled; None when the request is not sampled
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+# Reports of the most recent sampled requests, newest last
+recent_query_reports: deque[dict[str, Any]] = deque(maxlen=settings.sql_recent_requests)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if current_query_stats.get() is not None:
+        context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = current_query_stats.get()
+    started_at = getattr(context, "_query_started_at", None)
+    if stats is not None and started_at is not None:
+        stats.record(statement, (time.perf_counter() - started_at) * 1000)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement on `engine` into the current request's QueryStats, if any."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
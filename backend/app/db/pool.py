@@ -0,0 +1,72 @@
+import time
+from typing import Any
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, PoolProxiedConnection
+from app.config.metrics import Histogram
+from app.db.instrumentation import current_query_stats
+
+# connection record info key: perf_counter() when the connection was handed out
+CHECKED_OUT_AT_KEY = "checked_out_at"
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that measures how long callers wait for a connection and
+    how long they then hold it. Checkout latency covers queueing for a free slot,
+    opening overflow connections and the pre-ping, i.e. everything before a
+    statement can run. Hold time runs from checkout until the connection is returned.
+    """
+
+    def __init__(self, *args: Any, **kw: Any) -> None:
+        super().__init__(*args, **kw)
+        self.checkout_time = Histogram()
+        self.hold_time = Histogram()
+        self.waiting = 0
+        self.timeouts = 0
+
+    def connect(self) -> PoolProxiedConnection:
+        started_at = time.perf_counter()
+        # only callers that will block on the queue count as waiting, not every checkout
+        will_wait = self._exhausted()
+        if will_wait:
+            self.waiting += 1
+        try:
+            connection = super().connect()
+            connection.info[CHECKED_OUT_AT_KEY] = time.perf_counter()
+            return connection
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            if will_wait:
+                self.waiting -= 1
+            self.checkout_time.observe((time.perf_counter() - started_at) * 1000)
+
+    def _exhausted(self) -> bool:
+        """No idle connection and no room to open an overflow one, so a checkout has to queue."""
+        if self.checkedin() > 0 or self._max_overflow < 0:
+            return False
+        return self.overflow() >= self._max_overflow
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        checked_out_at = record.info.pop(CHECKED_OUT_AT_KEY, None)
+        if checked_out_at is not None:
+            held_ms = (time.perf_counter() - checked_out_at) * 1000
+            self.hold_time.observe(held_ms)
+            stats = current_query_stats.get()
+            if stats is not None:
+                stats.hold_ms += held_ms
+        super()._do_return_conn(record)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow_in_use": max(self.overflow(), 0),
+            "waiting": self.waiting,
+            "timeouts": self.timeouts,
+            "checkout_time": self.checkout_time.stats(),
+            "hold_time": self.hold_time.stats(),
+        }
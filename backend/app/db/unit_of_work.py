@@ -0,0 +1,74 @@
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.db_connection import get_async_session
+
+# session.info key repositories check before flushing; > 0 while inside UnitOfWork.batch()
+BATCH_DEPTH_KEY = "uow_batch_depth"
+# session.info key holding callbacks to run once the unit of work commits
+AFTER_COMMIT_KEY = "uow_after_commit"
+
+
+def call_after_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """Run `callback` after the session's unit of work commits; dropped on rollback."""
+    session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+
+class UnitOfWork:
+    """
+    One transaction per request. Repositories only flush their writes; the
+    request commits once when the endpoint returns, or rolls back if it raises.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def flush(self) -> None:
+        await self.session.flush()
+
+    async def commit(self) -> None:
+        """Commit now, e.g. to persist a write before raising an error the request should still fail with."""
+        await self.session.commit()
+        for callback in self.session.info.pop(AFTER_COMMIT_KEY, []):
+            await callback()
+
+    async def release(self) -> None:
+        """
+        End the transaction and hand the connection back to the pool now. For read-only
+        paths once their last query has run; the session reconnects if used again.
+        """
+        if self.session.in_transaction():
+            await self.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+        self.session.info.pop(AFTER_COMMIT_KEY, None)
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator["UnitOfWork"]:
+        """Defer repository flushes inside the block and send them as one flush at the end."""
+        self.session.info[BATCH_DEPTH_KEY] = self.session.info.get(BATCH_DEPTH_KEY, 0) + 1
+        try:
+            yield self
+        finally:
+            self.session.info[BATCH_DEPTH_KEY] -= 1
+        if not self.session.info[BATCH_DEPTH_KEY]:
+            await self.session.flush()
+
+
+async def get_unit_of_work(
+    session: AsyncSession = Depends(get_async_session),
+) -> AsyncGenerator[UnitOfWork, None]:
+    """
+    Request unit of work; depend on it with scope="function" so the commit
+    happens before the response is sent and a failed commit becomes an error response.
+    """
+    uow = UnitOfWork(session)
+    try:
+        yield uow
+    except Exception:
+        await uow.rollback()
+        raise
+    if session.in_transaction():
+        await uow.commit()
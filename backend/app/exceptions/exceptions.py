@@ -63,3 +63,20 @@ class InvalidOperationException(Exception):
     def __init__(self, message: str):
         super().__init__(message)
         self.message = message
+
+
+class ServiceUnavailableException(Exception):
+    """ custom exception when a service is temporarily overloaded """
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+class NotModifiedException(Exception):
+    """ custom exception when a conditional GET finds the client's copy still current """
+
+    def __init__(self, headers: dict[str, str]):
+        super().__init__("Not modified")
+        self.message = "Not modified"
+        self.headers = headers
@@ -0,0 +1,242 @@
+import zlib
+from functools import lru_cache
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:     # optional: pip install .[compression]
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class GzipCompressor:
+    encoding = "gzip"
+    levels = {"fast": 1, "default": 6, "best": 9}
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        # sync flush so a streamed chunk reaches the client now, not when the window fills
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliCompressor:
+    encoding = "br"
+    levels = {"fast": 1, "default": 4, "best": 11}
+
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class ZstdCompressor:
+    encoding = "zstd"
+    levels = {"fast": 1, "default": 3, "best": 19}
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+# Installed codecs in server preference order, used to break Accept-Encoding q-value ties
+CODECS = {
+    codec.encoding: codec
+    for codec, available in (
+        (ZstdCompressor, zstandard is not None),
+        (BrotliCompressor, brotli is not None),
+        (GzipCompressor, True),
+    )
+    if available
+}
+
+# Content types that are already compressed; recompressing them only burns CPU
+INCOMPRESSIBLE_TYPES = (
+    "image/", "video/", "audio/", "font/woff",
+    "application/zip", "application/gzip", "application/x-gzip", "application/zstd",
+    "application/x-bzip2", "application/x-7z-compressed", "application/x-rar-compressed",
+)
+COMPRESSIBLE_IMAGES = ("image/svg+xml",)
+
+
+@lru_cache(maxsize=128)
+def negotiate(accept_encoding: str) -> str | None:
+    """
+    Best installed encoding for an Accept-Encoding header, or None for identity.
+    Highest q-value wins; equal q-values go to the server's preferred codec.
+    Clients send a handful of distinct headers, so the parse is cached.
+    """
+    weights: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip()] = quality
+
+    wildcard = weights.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in CODECS:
+        quality = weights.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with zstd, brotli or gzip, whichever the client prefers
+    among the installed codecs. Streaming responses are compressed chunk by chunk
+    and flushed as they go, so nothing is buffered beyond `minimum_size` bytes.
+    Bodies smaller than that, already-encoded responses and already-compressed
+    content types are passed through untouched.
+
+    `route_levels` maps path prefixes to a level ("fast", "default", "best" or
+    "off"); the longest matching prefix wins, other paths use `level`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        level: str = "default",
+        route_levels: dict[str, str] | None = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        # longest prefix first so the most specific route wins
+        self.route_levels = sorted(
+            ((prefix.rstrip("/"), level) for prefix, level in (route_levels or {}).items()),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        level = self._level_for(scope["path"])
+        if encoding is None or level == "off":
+            await self.app(scope, receive, send)
+            return
+
+        codec = CODECS[encoding]
+        responder = _CompressingResponder(send, codec, codec.levels[level], self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+    def _level_for(self, path: str) -> str:
+        for prefix, level in self.route_levels:
+            # match whole path segments: /sessions/export must not cover /sessions/exports
+            if path == prefix or path.startswith(prefix + "/"):
+                return level
+        return self.level
+
+
+class _CompressingResponder:
+    """ Per-response state: holds the start message until the body shows whether to compress """
+
+    def __init__(self, send: Send, codec: type, level: int, minimum_size: int) -> None:
+        self._send = send
+        self._codec = codec
+        self._level = level
+        self._minimum_size = minimum_size
+        self._start: Message | None = None
+        self._pending: list[bytes] = []     # body held back while deciding, at most ~minimum_size bytes
+        self._pending_size = 0
+        self._compressor = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if self._passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            if self._compressible(message):
+                self._start = message
+            else:
+                self._passthrough = True
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._compressor is not None:
+            data = self._compressor.compress(body) if more_body else self._compressor.finish(body)
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        self._pending.append(body)
+        self._pending_size += len(body)
+        if self._pending_size < self._minimum_size:
+            if more_body:
+                return
+            # the whole body turned out small: send it as it was
+            await self._flush_uncompressed()
+            return
+
+        held, self._pending = b"".join(self._pending), []
+        self._compressor = self._codec(self._level)
+        headers = MutableHeaders(scope=self._start)
+        headers["Content-Encoding"] = self._codec.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # the encoded bytes differ from the identity ones, so the validator is only weak now
+            headers["ETag"] = "W/" + etag
+        if more_body:
+            del headers["Content-Length"]
+            data = self._compressor.compress(held)
+        else:
+            data = self._compressor.finish(held)
+            headers["Content-Length"] = str(len(data))
+        await self._send(self._start)
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _compressible(self, start: Message) -> bool:
+        status = start["status"]
+        if status < 200 or status in (204, 206, 304):
+            return False
+        headers = Headers(raw=start["headers"])
+        if "content-encoding" in headers:
+            return False
+        content_length = headers.get("content-length")
+        if content_length is not None and int(content_length) < self._minimum_size:
+            return False
+        content_type = headers.get("content-type", "").lower()
+        return content_type.startswith(COMPRESSIBLE_IMAGES) or not content_type.startswith(INCOMPRESSIBLE_TYPES)
+
+    async def _flush_uncompressed(self) -> None:
+        self._passthrough = True
+        await self._send(self._start)
+        await self._send({"type": "http.response.body", "body": b"".join(self._pending), "more_body": False})
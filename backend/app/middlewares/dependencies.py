@@ -1,10 +1,16 @@
+import hashlib
+import hmac
+from collections.abc import Awaitable, Callable
 from uuid import UUID
-from fastapi import Depends
+from fastapi import Depends, Header, Request
 from fastapi.security import APIKeyCookie, HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 from app.modules.user_service.utils.auth_utils import JWTUtils
-from app.exceptions.exceptions import UnauthorizedAccessException
+from app.exceptions.exceptions import NotModifiedException, UnauthorizedAccessException
 from app.config.settings import settings
+from app.config.cache import LRUCache
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.db_connection import get_async_session, use_primary
 
 # Security schemes for Swagger UI - shows lock icon
 access_token_cookie = APIKeyCookie(name="access_token", auto_error=False)
@@ -18,6 +24,10 @@ class CurrentUser(BaseModel):
     name: str
 
 
+# Verified token payloads keyed by sha256(token); entries leave at the token's `exp` or by LRU.
+access_token_cache: LRUCache[bytes, CurrentUser] = LRUCache(maxsize=settings.access_token_cache_size)
+
+
 async def get_access_token(
     cookie_token: str | None = Depends(access_token_cookie),
     bearer_token: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
@@ -39,23 +49,22 @@ async def get_access_token(
     raise UnauthorizedAccessException("Not authenticated")
 
 
-async def get_current_user(
-    access_token: str = Depends(get_access_token),
-) -> CurrentUser:
+def resolve_current_user(access_token: str) -> CurrentUser:
     """
-    Get current authenticated user from access token payload.
-    NO database call - extracts user data directly from JWT.
-    
-    Token sources:
-    - Cookie: Works in both dev and production
-    - Bearer header: Only works in development
+    Return the user for a verified access token.
+    A cache hit skips signature verification and JSON parsing entirely.
     """
+    cache_key = hashlib.sha256(access_token.encode("utf-8")).digest()
+    current_user = access_token_cache.get(cache_key)
+    if current_user is not None:
+        return current_user
+
     payload = JWTUtils.decode_access_token(access_token)
     if not payload or "sub" not in payload:
         raise UnauthorizedAccessException("Invalid or expired access token")
     
     try:
-        return CurrentUser(
+        current_user = CurrentUser(
             id=UUID(payload["sub"]),
             email=payload.get("email", ""),
             name=payload.get("name", "")
@@ -63,6 +72,24 @@ async def get_current_user(
     except (ValueError, KeyError):
         raise UnauthorizedAccessException("Invalid token payload")
 
+    if "exp" in payload:
+        access_token_cache.set(cache_key, current_user, expires_at=float(payload["exp"]))
+    return current_user
+
+
+async def get_current_user(
+    access_token: str = Depends(get_access_token),
+) -> CurrentUser:
+    """
+    Get current authenticated user from access token payload.
+    NO database call - extracts user data directly from JWT.
+    
+    Token sources:
+    - Cookie: Works in both dev and production
+    - Bearer header: Only works in development
+    """
+    return resolve_current_user(access_token)
+
 
 async def get_current_user_id(
     access_token: str = Depends(get_access_token),
@@ -71,11 +98,75 @@ async def get_current_user_id(
     Get current user ID from access token.
     Use this when you only need the user ID.
     """
-    payload = JWTUtils.decode_access_token(access_token)
-    if not payload or "sub" not in payload:
-        raise UnauthorizedAccessException("Invalid or expired access token")
-    
-    try:
-        return UUID(payload["sub"])
-    except ValueError:
-        raise UnauthorizedAccessException("Invalid token payload")
\ No newline at end of file
+    return resolve_current_user(access_token).id
+
+
+async def require_internal_access(
+    x_metrics_token: str | None = Header(None),
+) -> None:
+    """
+    Guard for internal metrics endpoints.
+    With `internal_metrics_token` set the header must match it,
+    otherwise access is only allowed outside production.
+    """
+    if settings.internal_metrics_token:
+        if x_metrics_token and hmac.compare_digest(x_metrics_token, settings.internal_metrics_token):
+            return
+        raise UnauthorizedAccessException("Invalid metrics token")
+    if settings.env == "production":
+        raise UnauthorizedAccessException("Internal metrics are disabled")
+
+
+async def read_your_writes(
+    session: AsyncSession = Depends(get_async_session),
+) -> None:
+    """
+    Pin the request's database session to the primary.
+    For endpoints that read rows they are about to change, or that a client may have just written.
+    """
+    use_primary(session)
+
+
+async def current_user_version(
+    current_user: CurrentUser = Depends(get_current_user),
+) -> str:
+    """Version key of the profile served from the access token: it only changes with the token's claims."""
+    return f"{current_user.id}:{current_user.email}:{current_user.name}"
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match check with weak comparison, as RFC 9110 requires for If-None-Match."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def conditional_get(
+    version: Callable[..., Awaitable[str]],
+    cache_control: str = "private, no-cache",
+) -> Callable[..., Awaitable[dict[str, str]]]:
+    """
+    Dependency factory for conditional GETs.
+    `version` is a dependency returning a cheap key that changes whenever the route's data does
+    (an updated_at, a per-user set version). The ETag is derived from that key, the path and the
+    query string. It is weak: the envelope's local_date_time differs between bodies sharing it,
+    and the same W/ tag goes out on the 200, the 304 and after compression.
+    A matching If-None-Match raises NotModifiedException, answered with 304 before the route
+    queries or serialises anything. Otherwise the dependency returns the ETag and Cache-Control
+    headers for the route to send with its response.
+    """
+    async def dependency(
+        request: Request,
+        key: str = Depends(version),
+        if_none_match: str | None = Header(None),
+    ) -> dict[str, str]:
+        digest = hashlib.blake2b(
+            f"{request.url.path}?{request.url.query}\0{key}".encode("utf-8"), digest_size=16
+        ).hexdigest()
+        headers = {"ETag": f'W/"{digest}"', "Cache-Control": cache_control}
+        if if_none_match and etag_matches(if_none_match, headers["ETag"]):
+            raise NotModifiedException(headers)
+        return headers
+
+    return dependency
@@ -0,0 +1,64 @@
+import logging
+import random
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.db.instrumentation import QueryStats, current_query_stats, recent_query_reports
+
+logger = logging.getLogger(__name__)
+
+
+class SQLInstrumentationMiddleware:
+    """
+    Collects the statements of a sampled share of requests and reports them as
+    X-DB-Queries / X-DB-Time-Ms / X-DB-Hold-Ms / Server-Timing headers and in the recent-requests
+    buffer. Repeated statement shapes are logged as suspected N+1 queries.
+    Unsampled requests only pay for a contextvar lookup per statement.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = 1.0,
+        slowest_kept: int = 3,
+        n_plus_one_threshold: int = 5,
+    ) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slowest_kept = slowest_kept
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(slowest_kept=self.slowest_kept)
+        token = current_query_stats.set(stats)
+
+        async def send_with_stats(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # the unit of work has committed by now, so every statement of the request is in
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Queries"] = str(stats.count)
+                headers["X-DB-Time-Ms"] = f"{stats.total_ms:.1f}"
+                headers["X-DB-Hold-Ms"] = f"{stats.hold_ms:.1f}"
+                headers.append("Server-Timing", f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries"')
+                headers.append("Server-Timing", f'db-hold;dur={stats.hold_ms:.1f};desc="connection held"')
+                self._report(scope, message["status"], stats)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            current_query_stats.reset(token)
+
+    def _report(self, scope: Scope, status_code: int, stats: QueryStats) -> None:
+        report = stats.report(self.n_plus_one_threshold)
+        recent_query_reports.append(
+            {"method": scope["method"], "path": scope["path"], "status": status_code, **report}
+        )
+        for suspect in report["n_plus_one"]:
+            logger.warning(
+                f"Suspected N+1 on {scope['method']} {scope['path']}: "
+                f"{suspect['count']}x {suspect['statement'][:200]}"
+            )
@@ -1,17 +1,20 @@
 import logging 
 import io
 import asyncio
-import polars as pl
-from typing import List
-from pypdf import PdfReader
-from langchain_core.documents import Document
-from langchain_text_splitter import RecursiveCharacterTextSplitter
+from typing import TYPE_CHECKING, List
 
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+
+# polars, pypdf and langchain are slow to import and only document ingestion needs
+# them, so they are imported on first use rather than at worker startup.
 
 logger = logging.Logger(__name__)
 
 class DocProcessor:
     def __init__(self):
+        from langchain_text_splitter import RecursiveCharacterTextSplitter
+
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1024,
             chunk_overlap=200,
@@ -30,7 +33,7 @@ class DocProcessor:
             "txt": self._process_text,
         }
 
-    async def process(self, doc_content: bytes, file_type: str) -> List[Document]:
+    async def process(self, doc_content: bytes, file_type: str) -> List["Document"]:
         file_type = file_type.lower().split(".").replace("application/", "")
         handler = self.DOCS_TYPES.get(file_type)
         if not handler:
@@ -46,8 +49,10 @@ class DocProcessor:
                 logger.error(f"Failed to process {file_type} document: {e}")
                 return[]
 
-    def _process_pdf(self, content: bytes) -> List[Document]:
+    def _process_pdf(self, content: bytes) -> List["Document"]:
         """Extract text from PDF document"""
+        from pypdf import PdfReader
+
         text = ""
         try:
             reader = PdfReader(io.BytesIO(content))
@@ -59,8 +64,10 @@ class DocProcessor:
 
         return self.text_splitter.create_documents([text])
     
-    def _process_csv(self, content: bytes) -> List[Document]:
+    def _process_csv(self, content: bytes) -> List["Document"]:
         """Extract text from CSV document using polars"""
+        import polars as pl
+
         try:
             df = pl.read_csv(io.BytesIO(content))
             text_data = []
@@ -74,8 +81,10 @@ class DocProcessor:
             return[]
 
 
-    def _process_excel(self, content: bytes) -> List[Document]:
+    def _process_excel(self, content: bytes) -> List["Document"]:
         """Extract text from Excel document using polars"""
+        import polars as pl
+
         try:
             df = pl.read_excel(io.BytesIO(content))
             text_data = []
@@ -88,7 +97,7 @@ class DocProcessor:
             logger.error(f"Failed to extract text from Excel document: {e}")
             return[]     
 
-    def _process_text(self, content: bytes) -> List[Document]:
+    def _process_text(self, content: bytes) -> List["Document"]:
         """Extract text from text document"""
         try:
             text = content.decode("utf-8", errors="ignore")
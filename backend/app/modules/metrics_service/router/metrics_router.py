@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends
+from app.advices.base_response import BaseResponse
+from app.advices.response import SuccesResponseSchema
+from app.config.base_repository import identity_caches
+from app.db.instrumentation import recent_query_reports
+from app.db.db_connection import engine, replica_engines
+from app.middlewares.dependencies import access_token_cache, require_internal_access
+from app.modules.user_service.utils.security import password_hash_pool
+
+router = APIRouter(dependencies=[Depends(require_internal_access)])
+
+@router.get(
+    "/auth-cache",
+    summary="Access token cache statistics",
+    response_model=SuccesResponseSchema[dict]
+)
+async def auth_cache_metrics():
+    return BaseResponse.succes_response(data=access_token_cache.stats())
+
+@router.get(
+    "/password-hash",
+    summary="Password hashing pool statistics",
+    response_model=SuccesResponseSchema[dict]
+)
+async def password_hash_metrics():
+    return BaseResponse.succes_response(data=password_hash_pool.stats())
+
+
+@router.get(
+    "/identity-cache",
+    summary="Repository identity cache statistics per table",
+    response_model=SuccesResponseSchema[dict]
+)
+async def identity_cache_metrics():
+    return BaseResponse.succes_response(data={name: cache.stats() for name, cache in identity_caches.items()})
+
+
+@router.get(
+    "/sql",
+    summary="Statement counts, DB time and suspected N+1s of recent sampled requests",
+    response_model=SuccesResponseSchema[list]
+)
+async def sql_metrics():
+    return BaseResponse.succes_response(data=list(reversed(recent_query_reports)))
+
+
+@router.get(
+    "/db-pool",
+    summary="Connection pool usage and checkout latency per engine",
+    response_model=SuccesResponseSchema[dict]
+)
+async def db_pool_metrics():
+    return BaseResponse.succes_response(data={
+        "primary": engine.pool.stats(),
+        "replicas": [replica.pool.stats() for replica in replica_engines],
+    })
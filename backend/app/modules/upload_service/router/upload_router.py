@@ -1,6 +1,7 @@
 from fastapi import APIRouter , UploadFile , Form ,Depends
 from app.modules.upload_service.schema.upload_schema import UploadFileResponse, UploadMeta
 from app.advices.response import SuccesResponseSchema
+from app.advices.base_response import BaseResponse
 from app.modules.upload_service.service.upload_service import get_upload_service
 from app.modules.upload_service.service.upload_service import UploadService
 from app.middlewares.dependencies import get_current_user, CurrentUser
@@ -25,4 +26,4 @@ async def upload_file(
 ):
     user_id = str(user.id)
     result = await service.upload_file(file, meta , user_id)
-    return SuccesResponseSchema(data=result)
\ No newline at end of file
+    return BaseResponse.succes_response(data=result)
\ No newline at end of file
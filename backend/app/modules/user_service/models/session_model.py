@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import String, DateTime, ForeignKey, func
+from sqlalchemy import String, DateTime, ForeignKey, Index, func
 from datetime import datetime
 from app.config.base import Base
 import uuid
@@ -8,6 +8,10 @@ from app.modules.user_service.models.user_model import User
 
 class Session(Base):
     __tablename__="sessions"
+    __table_args__ = (
+        # seek index for keyset pagination of a user's sessions by (created_at, id)
+        Index("ix_sessions_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -17,9 +21,12 @@ class Session(Base):
         index=True,
     )
 
-    refresh_token: Mapped[str] = mapped_column(
-        String(255),
+    # sha256 hex digest of the refresh JWT; the raw token is never stored
+    refresh_token_hash: Mapped[str] = mapped_column(
+        String(64),
         nullable=False,
+        unique=True,
+        index=True,
     )
 
     expires_at: Mapped[datetime] = mapped_column(
@@ -60,4 +67,25 @@ class Session(Base):
 
     user: Mapped["User"] = relationship(
         back_populates="sessions",
+    )
+
+
+class SupersededRefreshToken(Base):
+    """
+    Digest of every refresh token a session has rotated away from.
+    A session is one token family, so replaying any earlier generation finds
+    the session to revoke; rows go with their session via ON DELETE CASCADE.
+    """
+    __tablename__ = "superseded_refresh_tokens"
+
+    token_hash: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+    )
+
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("sessions.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
\ No newline at end of file
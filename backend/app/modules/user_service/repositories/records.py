@@ -0,0 +1,39 @@
+import uuid
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any
+from sqlalchemy import Select, select
+from sqlalchemy.orm import DeclarativeBase
+
+
+# Read-only projections for hot paths: plain slotted objects built from a row,
+# with no identity map entry, change tracking or instance state behind them.
+
+@dataclass(slots=True, frozen=True)
+class UserAuthRecord:
+    """User columns the auth flows read"""
+    id: uuid.UUID
+    name: str
+    email: str
+    password: str | None
+    is_verified: bool
+    verification_code: str | None
+    verification_code_expiry: datetime | None
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass(slots=True, frozen=True)
+class SessionRecord:
+    """Session columns shown to the user"""
+    id: uuid.UUID
+    user_agent: str | None
+    ip_address: str | None
+    expires_at: datetime
+    created_at: datetime
+    updated_at: datetime
+
+
+def select_record(record: type[Any], model: type[DeclarativeBase]) -> Select:
+    """SELECT of the model columns named by the record's fields, in field order."""
+    return select(*(getattr(model, field.name) for field in fields(record)))
@@ -1,39 +1,197 @@
-from sqlalchemy import select, delete
+import uuid
+from collections.abc import AsyncIterator
+from sqlalchemy import Row, bindparam, select, delete, func, insert, update
 from typing import Any
+from datetime import datetime
 from app.config.base_repository import BaseRepository
-from app.modules.user_service.models.session_model import Session
+from app.config.pagination import CountStrategy
+from app.modules.user_service.models.session_model import Session, SupersededRefreshToken
+from app.modules.user_service.models.user_model import User
+from app.modules.user_service.repositories.records import SessionRecord, select_record
+from app.modules.user_service.utils.auth_utils import JWTUtils
+
+# Hot statements are built once with bind parameters; see user_repository
+_select_by_refresh_token_hash = select(Session).where(Session.refresh_token_hash == bindparam("token_hash"))
+_select_by_user_id = (
+    select(Session).where(Session.user_id == bindparam("user_id")).order_by(Session.created_at.desc())
+)
+_select_records_by_user_id = (
+    select_record(SessionRecord, Session)
+    .where(Session.user_id == bindparam("user_id"))
+    .order_by(Session.created_at.desc())
+)
+# count + newest updated_at: any insert, delete or update of the user's sessions moves one of them
+_select_version_by_user_id = (
+    select(func.count(), func.max(Session.updated_at)).where(Session.user_id == bindparam("user_id"))
+)
+# WITH rotated AS (UPDATE ... FROM users RETURNING ...), recorded AS (INSERT INTO superseded_refresh_tokens
+# SELECT :token_hash, session_id FROM rotated) SELECT * FROM rotated: one statement per refresh
+_rotated = (
+    update(Session)
+    .where(
+        Session.refresh_token_hash == bindparam("token_hash"),
+        Session.expires_at > func.now(),
+        Session.user_id == User.id,
+    )
+    .values(
+        refresh_token_hash=bindparam("new_token_hash"),
+        expires_at=bindparam("new_expires_at"),
+    )
+    .returning(
+        Session.id.label("session_id"),
+        User.id,
+        User.name,
+        User.email,
+        User.is_verified,
+        User.created_at,
+        User.updated_at,
+    )
+    .cte("rotated")
+)
+_recorded = (
+    insert(SupersededRefreshToken)
+    .from_select(
+        ["token_hash", "session_id"],
+        select(bindparam("token_hash", type_=SupersededRefreshToken.token_hash.type), _rotated.c.session_id),
+    )
+    .cte("recorded")
+)
+_rotate_refresh_token = select(_rotated).add_cte(_recorded)
+# replaying any superseded generation revokes the whole family, i.e. the session
+_revoke_by_superseded_token = (
+    delete(Session)
+    .where(
+        Session.id == select(SupersededRefreshToken.session_id)
+        .where(SupersededRefreshToken.token_hash == bindparam("token_hash"))
+        .scalar_subquery()
+    )
+    .returning(Session.id)
+)
 
 class SessionRepository(BaseRepository[Session]):
     model = Session
 
     async def get_by_refresh_token(self, refresh_token: str) -> Session | None:
-        stmt = select(self.model).where(self.model.refresh_token == refresh_token)
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(
+            _select_by_refresh_token_hash, {"token_hash": JWTUtils.hash_token(refresh_token)}
+        )
         return result.scalars().first()
 
     async def get_by_user_id(self, user_id: Any) -> list[Session]:
-        stmt = select(self.model).where(self.model.user_id == user_id).order_by(self.model.created_at.desc())
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(_select_by_user_id, {"user_id": user_id})
         return list(result.scalars().all())
 
-    async def delete_by_user_id(self, user_id: Any) -> None:
-        stmt = delete(self.model).where(self.model.user_id == user_id)
-        await self.session.execute(stmt)
-        await self.session.commit()
-
-    async def delete_by_refresh_token(self, refresh_token: str) -> None:
-        stmt = delete(self.model).where(self.model.refresh_token == refresh_token)
-        await self.session.execute(stmt)
-        await self.session.commit()
-
-    async def enforce_session_limit(self, user_id: Any, limit: int = 3) -> None:
-        stmt = select(self.model).where(self.model.user_id == user_id).order_by(self.model.created_at.asc())
-        result = await self.session.execute(stmt)
-        sessions = result.scalars().all()
-        
-        if len(sessions) >= limit:
-            sessions_to_delete = sessions[:(len(sessions) - limit + 1)]
-            for session in sessions_to_delete:
-                await self.session.delete(session)
+    async def get_records_by_user_id(self, user_id: Any) -> list[SessionRecord]:
+        """Newest-first sessions of a user as plain records, for read-only listings."""
+        result = await self.session.execute(_select_records_by_user_id, {"user_id": user_id})
+        return [SessionRecord(*row) for row in result]
+
+    async def get_version_by_user_id(self, user_id: Any) -> tuple[int, datetime | None]:
+        """(session count, newest updated_at) of a user: a version of the session set, from one aggregate."""
+        result = await self.session.execute(_select_version_by_user_id, {"user_id": user_id})
+        count, last_updated_at = result.one()
+        return count, last_updated_at
+
+    async def count_by_user_id(self, user_id: Any, strategy: CountStrategy) -> tuple[int, CountStrategy]:
+        """The total get_page_by_user_id reports under `strategy`, with the same criteria and cache key."""
+        return await self.count([self.model.user_id == user_id], strategy)
+
+    def stream_by_user_id(self, user_id: Any) -> AsyncIterator[Session]:
+        """Oldest-first stream of the user's sessions from a server-side cursor."""
+        return self.stream_where(self.model.user_id == user_id, order_by="created_at")
+
+    async def get_page_by_user_id(
+        self,
+        user_id: Any,
+        limit: int = 10,
+        cursor: str | None = None,
+        count_strategy: CountStrategy | None = None,
+    ) -> dict[str, Any]:
+        """Newest-first keyset page of the user's sessions, served by ix_sessions_user_id_created_at_id."""
+        return await self.get_all_keyset(
+            limit=limit,
+            cursor=cursor,
+            order_by="created_at",
+            descending=True,
+            filters=[self.model.user_id == user_id],
+            count_strategy=count_strategy,
+        )
+
+    async def delete_by_user_id(self, user_id: Any, except_refresh_token: str | None = None) -> int:
+        criteria = [self.model.user_id == user_id]
+        if except_refresh_token:
+            criteria.append(self.model.refresh_token_hash != JWTUtils.hash_token(except_refresh_token))
+        return await self.delete_where(*criteria)
+
+    async def delete_by_refresh_token(self, refresh_token: str) -> int:
+        return await self.delete_where(self.model.refresh_token_hash == JWTUtils.hash_token(refresh_token))
+
+    async def delete_for_user(self, session_id: Any, user_id: Any) -> bool:
+        """Delete one session only if it belongs to the user."""
+        return await self.delete_where(self.model.id == session_id, self.model.user_id == user_id) > 0
+
+    async def rotate_refresh_token(
+        self, refresh_token: str, new_refresh_token: str, expires_at: datetime, commit: bool = False
+    ) -> Row[Any] | None:
+        """
+        Swap a live refresh token for a new one and record the old digest against the session
+        for reuse detection, in one statement (UPDATE ... FROM users and INSERT as CTEs).
+        Returns the session id plus the user columns needed for the access token,
+        or None when the token matches no unexpired session.
+        """
+        result = await self.session.execute(
+            _rotate_refresh_token,
+            {
+                "token_hash": JWTUtils.hash_token(refresh_token),
+                "new_token_hash": JWTUtils.hash_token(new_refresh_token),
+                "new_expires_at": expires_at,
+            },
+        )
+        row = result.first()
+        if commit:
+            await self.session.commit()
+        return row
+
+    async def revoke_reused_refresh_token(self, refresh_token: str, commit: bool = False) -> bool:
+        """
+        Delete the session that once issued the replayed token, whatever generation it was.
+        Returns True if one was revoked.
+        """
+        result = await self.session.execute(
+            _revoke_by_superseded_token, {"token_hash": JWTUtils.hash_token(refresh_token)}
+        )
+        revoked = result.first() is not None
+        if commit:
             await self.session.commit()
+        return revoked
+
+    def _evict_oldest_stmt(self, user_id: Any, keep: int):
+        """DELETE every session of the user except the `keep` newest ones."""
+        newest_first = (
+            select(self.model.id)
+            .where(self.model.user_id == user_id)
+            .order_by(self.model.created_at.desc(), self.model.id.desc())
+            .offset(keep)
+        )
+        return delete(self.model).where(self.model.id.in_(newest_first))
 
+    async def create_with_session_limit(
+        self, user_id: Any, limit: int = 3, commit: bool = False, **kwargs
+    ) -> Session:
+        """
+        Insert a session and evict the user's oldest ones beyond `limit` in one statement:
+        WITH evicted AS (DELETE ...) INSERT ... RETURNING. Postgres runs the data-modifying
+        CTE even though the INSERT never reads it, and both see the same snapshot.
+        """
+        evicted = self._evict_oldest_stmt(user_id, keep=limit - 1).returning(self.model.id).cte("evicted")
+        stmt = (
+            insert(self.model)
+            .add_cte(evicted)
+            .values(id=uuid.uuid4(), user_id=user_id, **kwargs)   # python-side defaults are skipped here
+            .returning(self.model)
+        )
+        result = await self.session.scalars(stmt)
+        session = result.one()
+        if commit:
+            await self.session.commit()
+        return session
@@ -1,11 +1,25 @@
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from app.config.base_repository import BaseRepository
 from app.modules.user_service.models.user_model import User
+from app.modules.user_service.repositories.records import UserAuthRecord, select_record
+
+# Hot statements are built once; reusing the construct skips rebuilding it and
+# regenerating its cache key on every call, the compiled form comes from the engine cache
+_select_by_email = select(User).where(User.email == bindparam("email"))
+_select_auth_record_by_email = select_record(UserAuthRecord, User).where(User.email == bindparam("email"))
 
 class UserRepository(BaseRepository[User]):
     model = User
+    # No cache_ttl yet: no hot read path loads users by id (/users/me is served from the token).
+    # Credentials are never cached; a cache hit reloads just these columns from the database.
+    cache_exclude = ("password", "verification_code", "verification_code_expiry")
 
     async def get_by_email(self, email: str) -> User | None:
-        stmt = select(self.model).where(self.model.email == email)
-        result = await self.session.execute(stmt)
-        return result.scalars().first()
\ No newline at end of file
+        result = await self.session.execute(_select_by_email, {"email": email})
+        return result.scalars().first()
+
+    async def get_auth_record_by_email(self, email: str) -> UserAuthRecord | None:
+        """Column-only lookup for the auth flows: a plain record instead of a tracked User."""
+        result = await self.session.execute(_select_auth_record_by_email, {"email": email})
+        row = result.first()
+        return UserAuthRecord(*row) if row is not None else None
@@ -10,11 +10,23 @@ from app.modules.user_service.schema.auth_schema import (
 )
 from app.advices.response import SuccesResponseSchema, ErrorResponseSchema, MessageSchema
 from app.modules.user_service.utils.auth_utils import CookieUtils
-from fastapi import APIRouter, Depends, Query, Response, Cookie
+from fastapi import APIRouter, Depends, Query, Cookie
 from app.modules.user_service.service.auth_service import UserService, get_user_service
-from app.advices.base_response import BaseResponse
+from app.advices.base_response import BaseResponse, EnvelopeResponse
+from app.middlewares.dependencies import read_your_writes
 
-router = APIRouter()
+# every auth flow reads the user and then writes, so replica lag must not apply
+router = APIRouter(dependencies=[Depends(read_your_writes)])
+
+
+def _with_auth_cookies(result: TokenResponseSchema | RefreshTokenSchema) -> EnvelopeResponse:
+    """
+    Success envelope carrying the auth cookies. They must be set on the response the route
+    returns: headers set on an injected Response are dropped when another one is returned.
+    """
+    json_response = BaseResponse.succes_response(data=result)
+    CookieUtils.set_auth_cookies(json_response, result.access_token, result.refresh_token)
+    return json_response
 
 @router.post(
     "/register",
@@ -47,13 +59,11 @@ async def register(
     response_model=SuccesResponseSchema[TokenResponseSchema]
 )
 async def login(
-    response: Response,
     data: LoginSchema,
     service: UserService = Depends(get_user_service)
 ):
     result = await service.login(data)
-    CookieUtils.set_auth_cookies(response, result.access_token, result.refresh_token)
-    return BaseResponse.succes_response(data=result)
+    return _with_auth_cookies(result)
 
 @router.post(
     "/verify",
@@ -61,13 +71,11 @@ async def login(
     response_model=SuccesResponseSchema[TokenResponseSchema]
 )
 async def verify_user(
-    response: Response,
     data: VerifySchema,
     service: UserService = Depends(get_user_service)
 ):
     result = await service.verify_user(data)
-    CookieUtils.set_auth_cookies(response, result.access_token, result.refresh_token)
-    return BaseResponse.succes_response(data=result)
+    return _with_auth_cookies(result)
 
 @router.post(
     "/refresh",
@@ -75,21 +83,11 @@ async def verify_user(
     response_model=SuccesResponseSchema[RefreshTokenSchema]
 )
 async def refresh_token(
-    response: Response,
     refresh_token: str = Cookie(None, description="Refresh token from cookie"),
     service: UserService = Depends(get_user_service)
 ):
     result = await service.refresh_token(refresh_token)
-    # Update access token cookie only
-    response.set_cookie(
-        key="access_token",
-        value=result.access_token,
-        max_age=30 * 60,
-        httponly=True,
-        samesite="lax",
-        path="/",
-    )
-    return BaseResponse.succes_response(data=result)
+    return _with_auth_cookies(result)
 
 @router.post(
     "/forgot-password",
@@ -134,10 +132,10 @@ async def reset_password(
     response_model=SuccesResponseSchema[MessageSchema]
 )
 async def logout(
-    response: Response,
     refresh_token: str = Cookie(None, description="Refresh token from cookie"),
     service: UserService = Depends(get_user_service)
 ):
     await service.logout(refresh_token)
-    CookieUtils.clear_auth_cookies(response)
-    return BaseResponse.succes_response(data={"message": "Logged out successfully"})
\ No newline at end of file
+    json_response = BaseResponse.succes_response(data={"message": "Logged out successfully"})
+    CookieUtils.clear_auth_cookies(json_response)
+    return json_response
\ No newline at end of file
@@ -1,37 +1,52 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends, Cookie
-from app.modules.user_service.schema.session_schema import SessionListSchema
+from fastapi import APIRouter, Depends, Cookie, Query
+from fastapi.responses import StreamingResponse
+from app.modules.user_service.schema.session_schema import SessionSchema, SessionListSchema
 from app.advices.response import SuccesResponseSchema, MessageSchema
 from app.advices.base_response import BaseResponse
+from app.config.pagination import CountStrategy
 from app.modules.user_service.service.session_service import SessionService, get_session_service
-from app.middlewares.dependencies import get_current_user, CurrentUser
+from app.middlewares.dependencies import get_current_user, CurrentUser, conditional_get
 
 router = APIRouter()
 
+
+async def session_set_version(
+    count: CountStrategy | None = Query(None, description="Include total using this count strategy"),
+    current_user: CurrentUser = Depends(get_current_user),
+    service: SessionService = Depends(get_session_service)
+) -> str:
+    return await service.get_session_set_version(current_user.id, count_strategy=count)
+
+
 @router.get(
     "/",
     summary="Get current user sessions",
     response_model=SuccesResponseSchema[SessionListSchema]
 )
 async def get_sessions(
+    limit: int | None = Query(None, ge=1, le=100, description="Page size; enables cursor pagination"),
+    cursor: str | None = Query(None, description="next_cursor or prev_cursor from a previous page"),
+    count: CountStrategy | None = Query(None, description="Include total using this count strategy"),
     current_user: CurrentUser = Depends(get_current_user),
-    service: SessionService = Depends(get_session_service)
+    service: SessionService = Depends(get_session_service),
+    cache_headers: dict[str, str] = Depends(conditional_get(session_set_version, "private, no-cache")),
 ):
-    result = await service.get_user_sessions(current_user.id)
-    return BaseResponse.succes_response(data=result)
+    result = await service.get_user_sessions(current_user.id, limit=limit, cursor=cursor, count_strategy=count)
+    return BaseResponse.succes_response(data=result, headers=cache_headers)
 
-@router.delete(
-    "/{session_id}",
-    summary="Delete user session",
-    response_model=SuccesResponseSchema[MessageSchema]
+@router.get(
+    "/export",
+    summary="Export current user sessions as NDJSON",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
 )
-async def delete_session(
-    session_id: UUID,
+async def export_sessions(
     current_user: CurrentUser = Depends(get_current_user),
     service: SessionService = Depends(get_session_service)
 ):
-    await service.delete_session(session_id)
-    return BaseResponse.succes_response(data={"message": "Session deleted successfully"})
+    sessions = service.export_user_sessions(current_user.id)
+    return BaseResponse.ndjson_response(sessions, SessionSchema)
 
 @router.delete(
     "/all",
@@ -43,5 +58,18 @@ async def delete_all_sessions(
     refresh_token: str = Cookie(None),
     service: SessionService = Depends(get_session_service)
 ):
-    await service.delete_all_sessions(current_user.id, refresh_token)
+    await service.revoke_all_session(current_user.id, refresh_token)
     return BaseResponse.succes_response(data={"message": "All sessions deleted successfully"})
+
+@router.delete(
+    "/{session_id}",
+    summary="Delete user session",
+    response_model=SuccesResponseSchema[MessageSchema]
+)
+async def delete_session(
+    session_id: UUID,
+    current_user: CurrentUser = Depends(get_current_user),
+    service: SessionService = Depends(get_session_service)
+):
+    await service.revoke_session(current_user.id, session_id)
+    return BaseResponse.succes_response(data={"message": "Session deleted successfully"})
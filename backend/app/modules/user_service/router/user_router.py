@@ -4,7 +4,13 @@ from app.modules.user_service.schema.user_schema import UpdateUserSchema,ChangeP
 from app.advices.base_response import BaseResponse
 from app.advices.response import SuccesResponseSchema, MessageSchema
 from app.modules.user_service.service.user_services import UserProfileService, get_user_profile_service
-from app.middlewares.dependencies  import get_current_user, CurrentUser
+from app.middlewares.dependencies  import (
+    get_current_user,
+    CurrentUser,
+    read_your_writes,
+    conditional_get,
+    current_user_version,
+)
 
 router = APIRouter()
 
@@ -14,9 +20,10 @@ router = APIRouter()
     response_model=SuccesResponseSchema[CurrentUser]
 )
 async def get_me(
-    current_user: CurrentUser = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user),
+    cache_headers: dict[str, str] = Depends(conditional_get(current_user_version, "private, no-cache")),
 ):
-    return BaseResponse.succes_response(data=current_user)
+    return BaseResponse.succes_response(data=current_user, headers=cache_headers)
 
 @router.put(
     "/me",
@@ -28,7 +35,7 @@ async def update_me(
     current_user: CurrentUser = Depends(get_current_user),
     service: UserProfileService = Depends(get_user_profile_service)
 ):
-    result = await service.update_user_profile(
+    result = await service.update_profile(
         user_id=current_user.id,
         data=data
     )
@@ -38,7 +45,8 @@ async def update_me(
 @router.post(
     "/me/change-password",
     summary="Change user password",
-    response_model=SuccesResponseSchema[MessageSchema]
+    response_model=SuccesResponseSchema[MessageSchema],
+    dependencies=[Depends(read_your_writes)]    # the current password must be checked against the primary
 )
 async def change_password(
     data: ChangePasswordSchema,
@@ -65,4 +65,5 @@ class TokenResponseSchema(BaseModel):
 class RefreshTokenSchema(BaseModel):
     """ Schema for refresh token """
     access_token: str
+    refresh_token: str
     user: ReturnUserSchema
\ No newline at end of file
@@ -17,4 +17,7 @@ class SessionSchema(BaseModel):
 class SessionListSchema(BaseModel):
     """Schema for creating a new session"""
     sessions: list[SessionSchema]
-    total: int
\ No newline at end of file
+    total: int | None = None
+    total_strategy: str | None = None      # exact, estimate or cached; None when total was not requested
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
\ No newline at end of file
@@ -1,3 +1,4 @@
+import logging
 from fastapi import Depends
 from app.modules.user_service.schema.auth_schema import (
     LoginSchema, RegisterSchema, VerifySchema, ForgotPasswordSchema, ResetPasswordSchema,
@@ -5,7 +6,7 @@ from app.modules.user_service.schema.auth_schema import (
 )
 from app.modules.user_service.repositories.user_repository import UserRepository
 from app.modules.user_service.models.user_model import User
-from app.modules.user_service.utils.security import get_password_hash, verify_password
+from app.modules.user_service.utils.security import get_password_hash_async, verify_password_async, password_needs_rehash
 from app.exceptions.exceptions import (
     InvalidCredentialsException,
     InvalidOperationException,
@@ -16,21 +17,27 @@ from app.exceptions.exceptions import (
     VerificationCodeExpiredException,
 )
 from app.modules.user_service.utils.auth_utils import JWTUtils, VerificationCodeUtils, CookieUtils
-from datetime import datetime, UTC
 from app.modules.user_service.repositories.session_repository import SessionRepository
+from app.db.unit_of_work import UnitOfWork, get_unit_of_work
+
+logger = logging.getLogger(__name__)
 
 
 class UserService:
-    def __init__(self, user_repository: UserRepository, session_repository: SessionRepository) -> None:
+    def __init__(
+        self, user_repository: UserRepository, session_repository: SessionRepository, uow: UnitOfWork
+    ) -> None:
         self.user_repository = user_repository
         self.session_repository = session_repository
+        self.uow = uow
 
     async def register(self, data: RegisterSchema) -> ReturnUserSchema:
-        user = await self.user_repository.get_by_email(data.email)
+        user = await self.user_repository.get_auth_record_by_email(data.email)
         if user:
             raise ResourceAlreadyExistsException("User with this email already exists")
 
-        hashed_password = get_password_hash(data.password)
+        await self.uow.release()    # don't hold a pooled connection while the hash runs
+        hashed_password = await get_password_hash_async(data.password)
         verification_code = VerificationCodeUtils.generate_verification_code()
         verification_code_expiry = VerificationCodeUtils.verification_code_expiry()
    
@@ -40,8 +47,7 @@ class UserService:
                 name=data.name,
                 password=hashed_password,
                 verification_code=verification_code,
-                verification_code_expiry=verification_code_expiry,
-                commit=True
+                verification_code_expiry=verification_code_expiry
             )
         else:
             user = await self.user_repository.create(
@@ -49,18 +55,24 @@ class UserService:
                 email=data.email,
                 password=hashed_password,
                 verification_code=verification_code,
-                verification_code_expiry=verification_code_expiry,
-                commit=True
+                verification_code_expiry=verification_code_expiry
             )
 
         return ReturnUserSchema.model_validate(user)
 
     async def login(self, data: LoginSchema) -> TokenResponseSchema:
-        user = await self.user_repository.get_by_email(data.email)
-        if not user or not verify_password(data.password, user.password):
+        user = await self.user_repository.get_auth_record_by_email(data.email)
+        await self.uow.release()    # don't hold a pooled connection while the hash runs
+        if not user or not await verify_password_async(data.password, user.password):
             raise InvalidCredentialsException("Invalid credentials")
         if not user.is_verified:
             raise ResourceNotVerifiedException(f"User is not verified with this email {data.email}")
+        if password_needs_rehash(user.password):
+            # Stored hash predates the current algorithm or cost: upgrade it while we have the plaintext
+            await self.user_repository.update(
+                id=user.id,
+                password=await get_password_hash_async(data.password)
+            )
 
         access_token = JWTUtils.create_access_token(data={
             "sub": str(user.id),
@@ -69,13 +81,11 @@ class UserService:
         })
         refresh_token = JWTUtils.create_refresh_token(user_id=str(user.id))
 
-        await self.session_repository.enforce_session_limit(user_id=user.id, limit=3)
-
-        await self.session_repository.create(
+        await self.session_repository.create_with_session_limit(
             user_id=user.id,
-            refresh_token=refresh_token,
-            expires_at=JWTUtils.get_refresh_token_expiry_time(),
-            commit=True
+            limit=3,
+            refresh_token_hash=JWTUtils.hash_token(refresh_token),
+            expires_at=JWTUtils.get_refresh_token_expiry_time()
         )
 
         return TokenResponseSchema(
@@ -85,7 +95,7 @@ class UserService:
         )
 
     async def verify_user(self, data: VerifySchema) -> TokenResponseSchema:
-        user = await self.user_repository.get_by_email(data.email)
+        user = await self.user_repository.get_auth_record_by_email(data.email)
         if not user:
             raise ResourceNotFoundException("User not found")
         if user.is_verified:
@@ -99,8 +109,7 @@ class UserService:
             id= user.id,
             is_verified=True,
             verification_code=None,
-            verification_code_expiry=None,
-            commit=True
+            verification_code_expiry=None
         )
 
         access_token = JWTUtils.create_access_token(data={
@@ -110,13 +119,11 @@ class UserService:
         })
         refresh_token = JWTUtils.create_refresh_token(user_id=str(user.id))
 
-        await self.session_repository.enforce_session_limit(user_id=user.id, limit=3)
-
-        await self.session_repository.create(
+        await self.session_repository.create_with_session_limit(
             user_id=user.id,
-            refresh_token=refresh_token,
-            expires_at=JWTUtils.get_refresh_token_expiry_time(),
-            commit=True
+            limit=3,
+            refresh_token_hash=JWTUtils.hash_token(refresh_token),
+            expires_at=JWTUtils.get_refresh_token_expiry_time()
         )
 
         return TokenResponseSchema(
@@ -127,34 +134,42 @@ class UserService:
 
       
     async def refresh_token(self, refresh_token: str) -> RefreshTokenSchema:
-        payload = JWTUtils.decode_refresh_token(refresh_token)
-        if not payload:
+        """
+        Rotate the refresh token. The lookup, expiry check, rotation and user fetch
+        are one UPDATE ... RETURNING; replaying any earlier token of the session revokes it.
+        """
+        payload = JWTUtils.decode_refresh_token(refresh_token) if refresh_token else None
+        if not payload or "sub" not in payload:
             raise UnauthorizedAccessException("Invalid refresh token")
-            
-        session = await self.session_repository.get_by_refresh_token(refresh_token)
-        if not session:
+
+        new_refresh_token = JWTUtils.create_refresh_token(user_id=payload["sub"])
+        row = await self.session_repository.rotate_refresh_token(
+            refresh_token=refresh_token,
+            new_refresh_token=new_refresh_token,
+            expires_at=JWTUtils.get_refresh_token_expiry_time()
+        )
+        if not row:
+            if await self.session_repository.revoke_reused_refresh_token(refresh_token):
+                # the request fails, so commit the revocation before the unit of work rolls back
+                await self.uow.commit()
+                logger.warning(f"Refresh token reuse detected for user {payload['sub']}, session revoked")
+                raise UnauthorizedAccessException("Refresh token reuse detected, session revoked")
             raise UnauthorizedAccessException("Session not found or expired")
-            
-        if session.expires_at < datetime.now(UTC):
-            raise UnauthorizedAccessException("Session has expired")
-        
-        user = await self.user_repository.get_by_id(session.user_id)
-        if not user:
-            raise ResourceNotFoundException("User not found")
 
         access_token = JWTUtils.create_access_token(data={
-            "sub": str(user.id),
-            "email": user.email,
-            "name": user.name
+            "sub": str(row.id),
+            "email": row.email,
+            "name": row.name
         })
         
         return RefreshTokenSchema(
             access_token=access_token,
-            user=ReturnUserSchema.model_validate(user)
+            refresh_token=new_refresh_token,
+            user=ReturnUserSchema.model_validate(row)
         )
 
     async def forgot_password(self, data: ForgotPasswordSchema) -> bool:
-        user = await self.user_repository.get_by_email(data.email)
+        user = await self.user_repository.get_auth_record_by_email(data.email)
         if not user:
             raise ResourceNotFoundException("User not found")
         if not user.is_verified:
@@ -166,8 +181,7 @@ class UserService:
         await self.user_repository.update(
             id=user.id,
             verification_code=verification_code,
-            verification_code_expiry=verification_code_expiry,
-            commit=True
+            verification_code_expiry=verification_code_expiry
         )
         # TODO: send mail
         return True
@@ -179,7 +193,7 @@ class UserService:
 
     async def reset_password(self, data: ResetPasswordSchema) -> bool:
         """Reset user password after verification"""
-        user = await self.user_repository.get_by_email(data.email)
+        user = await self.user_repository.get_auth_record_by_email(data.email)
         if not user:
             raise ResourceNotFoundException("User not found")
         if not user.is_verified:
@@ -189,19 +203,19 @@ class UserService:
         if user.verification_code != data.verification_code:
             raise InvalidOperationException("Invalid verification code")
         
-        hashed_password = get_password_hash(data.password)
+        await self.uow.release()    # don't hold a pooled connection while the hash runs
+        hashed_password = await get_password_hash_async(data.password)
         await self.user_repository.update(
             id=user.id,
             password=hashed_password,
             verification_code=None,
-            verification_code_expiry=None,
-            commit=True
+            verification_code_expiry=None
         )
         return True
 
     async def verify_code_valid(self, email: str, code: str) -> bool:
         """Verify if a code is valid for password reset"""
-        user = await self.user_repository.get_by_email(email)
+        user = await self.user_repository.get_auth_record_by_email(email)
         if not user:
             raise ResourceNotFoundException("User not found")
         if VerificationCodeUtils.is_verification_code_expired(user.verification_code_expiry):
@@ -213,6 +227,7 @@ class UserService:
 
 def get_user_service(
     user_repository: UserRepository = Depends(UserRepository),
-    session_repository: SessionRepository = Depends(SessionRepository)
+    session_repository: SessionRepository = Depends(SessionRepository),
+    uow: UnitOfWork = Depends(get_unit_of_work, scope="function")
 ) -> UserService:
-    return UserService(user_repository, session_repository)
\ No newline at end of file
+    return UserService(user_repository, session_repository, uow)
\ No newline at end of file
@@ -1,42 +1,76 @@
+from collections.abc import AsyncIterator
 from uuid import UUID
 from fastapi import Depends
 from app.modules.user_service.schema.session_schema import SessionSchema, SessionListSchema
 from app.modules.user_service.repositories.session_repository import SessionRepository
+from app.modules.user_service.models.session_model import Session
 from app.exceptions.exceptions import ResourceNotFoundException
+from app.config.pagination import CountStrategy
+from app.db.unit_of_work import UnitOfWork, get_unit_of_work
 
 
 class SessionService:
-    def __init__(self, session_repository: SessionRepository) -> None:
+    def __init__(self, session_repository: SessionRepository, uow: UnitOfWork) -> None:
         self.session_repository = session_repository
+        self.uow = uow
 
-    async def get_user_sessions(self, user_id: UUID) -> SessionListSchema:
-        """Get all sessions for a user"""
-        sessions = await self.session_repository.get_by_user_id(user_id)
+    async def get_user_sessions(
+        self,
+        user_id: UUID,
+        limit: int | None = None,
+        cursor: str | None = None,
+        count_strategy: CountStrategy | None = None,
+    ) -> SessionListSchema:
+        """Get all sessions for a user, or one keyset page when `limit` or `cursor` is given"""
+        if limit is None and cursor is None:
+            sessions = await self.session_repository.get_records_by_user_id(user_id)
+            await self.uow.release()    # read-only: return the connection before serialising
+            return SessionListSchema(
+                sessions = [SessionSchema.model_validate(s) for s in sessions],
+                total = len(sessions)
+            )
+
+        page = await self.session_repository.get_page_by_user_id(
+            user_id, limit=limit or 10, cursor=cursor, count_strategy=count_strategy
+        )
+        await self.uow.release()
         return SessionListSchema(
-            sessions = [SessionSchema.model_validate(s) for s in sessions],
-            total = len(sessions)
+            sessions = [SessionSchema.model_validate(s) for s in page[Session.__name__]],
+            total = page["total"],
+            total_strategy = page["total_strategy"],
+            next_cursor = page["next_cursor"],
+            prev_cursor = page["prev_cursor"],
         )
 
+    async def get_session_set_version(self, user_id: UUID, count_strategy: CountStrategy | None = None) -> str:
+        """
+        Version key of the user's session list, for conditional GETs.
+        Estimated and cached totals can move without the rows changing, so they are part of the key.
+        """
+        count, last_updated_at = await self.session_repository.get_version_by_user_id(user_id)
+        version = f"{user_id}:{count}:{last_updated_at.isoformat() if last_updated_at else ''}"
+        if count_strategy is not None and count_strategy != CountStrategy.EXACT:
+            total, total_strategy = await self.session_repository.count_by_user_id(user_id, count_strategy)
+            version += f":{total_strategy}:{total}"
+        return version
+
+    def export_user_sessions(self, user_id: UUID) -> AsyncIterator[Session]:
+        """Stream all sessions for a user without loading them at once"""
+        return self.session_repository.stream_by_user_id(user_id)
+
     async def revoke_session(self, user_id: UUID, session_id: UUID) -> bool:
         """Revoke a specific session for a user"""
-        session = await self.session_repository.get_by_id(session_id)
-        if not session:
-            raise ResourceNotFoundException("Session not found")
-        if session.user_id != user_id:
+        if not await self.session_repository.delete_for_user(session_id=session_id, user_id=user_id):
             raise ResourceNotFoundException("Session not found")
-        await self.session_repository.delete(id=session_id, commit=True)
         return True
 
     async def revoke_all_session(self, user_id: UUID, current_refresh_token: str | None = None) -> bool:
         """Revoke all session except current"""
-        sessions = await self.session_repository.get_by_user_id(user_id)
-        for session in sessions:
-            if current_refresh_token and session.refresh_token == current_refresh_token:
-                continue
-            await self.session_repository.delete(id=session.id, commit=True)
+        await self.session_repository.delete_by_user_id(user_id, except_refresh_token=current_refresh_token)
         return True
 
 def get_session_service(
-    session_repository: SessionRepository = Depends(SessionRepository)
+    session_repository: SessionRepository = Depends(SessionRepository),
+    uow: UnitOfWork = Depends(get_unit_of_work, scope="function")
 )-> SessionService:
-    return SessionService(session_repository)
+    return SessionService(session_repository, uow)
@@ -3,7 +3,8 @@ from fastapi import Depends
 from app.modules.user_service.repositories.user_repository import UserRepository
 from app.modules.user_service.schema.auth_schema import ReturnUserSchema
 from app.modules.user_service.schema.user_schema import UpdateUserSchema, ChangePasswordSchema
-from app.modules.user_service.utils.security import verify_password, get_password_hash
+from app.modules.user_service.utils.security import verify_password_async, get_password_hash_async
+from app.db.unit_of_work import UnitOfWork, get_unit_of_work
 from app.exceptions.exceptions import (
     InvalidCredentialsException,
     ResourceNotFoundException
@@ -11,54 +12,54 @@ from app.exceptions.exceptions import (
 
 
 class UserProfileService:
-    def __init__(self, user_repository: UserRepository) -> None:
+    def __init__(self, user_repository: UserRepository, uow: UnitOfWork) -> None:
         self.user_repository = user_repository
+        self.uow = uow
 
     async def get_current_user(self, user_id: UUID) -> ReturnUserSchema:
         """ Get current user """
         user = await self.user_repository.get_by_id(user_id)
+        await self.uow.release()    # read-only: return the connection before serialising
         if not user:
             raise ResourceNotFoundException("User not found")
         return ReturnUserSchema.model_validate(user)
     
     async def update_profile(self, user_id: UUID, data: UpdateUserSchema) -> ReturnUserSchema:
         """ Update user profile """
-        user = await self.user_repository.get_by_id(user_id)
-        if not user:
-            raise ResourceNotFoundException("User not found")
-        
         update_data = {}
         if data.name is not None:
             update_data["name"] = data.name
 
-        if update_data:
-            user = await self.user_repository.update(user_id, commit = True,**update_data)
+        # update() is a single UPDATE ... RETURNING, so no existence check beforehand
+        user = await self.user_repository.update(user_id, **update_data)
+        if not user:
+            raise ResourceNotFoundException("User not found")
 
         return ReturnUserSchema.model_validate(user)
 
     async def change_password(self, user_id: UUID, data: ChangePasswordSchema) -> bool:
         """ Change user password """
         user = await self.user_repository.get_by_id(user_id)
+        await self.uow.release()    # don't hold a pooled connection while the hashes run
         if not user:
             raise ResourceNotFoundException("User not found")
         
-        if not verify_password(data.current_password, user.password):
+        if not await verify_password_async(data.current_password, user.password):
             raise InvalidCredentialsException("Invalid password")
         
-        hashed_password = get_password_hash(data.new_password)
-        await self.user_repository.update(id=user_id, password=hashed_password, commit=True)
+        hashed_password = await get_password_hash_async(data.new_password)
+        await self.user_repository.update(id=user_id, password=hashed_password)
         return True
 
     async def delete_account(self, user_id: UUID) -> bool:
         """ Delete user account """
-        user = await self.user_repository.get_by_id(user_id)
-        if not user:
+        if not await self.user_repository.delete(id=user_id):
             raise ResourceNotFoundException("User not found")
-        await self.user_repository.delete(id=user_id, commit=True)
         return True
 
 
 def get_user_profile_service(
-    user_repository: UserRepository = Depends(UserRepository)
+    user_repository: UserRepository = Depends(UserRepository),
+    uow: UnitOfWork = Depends(get_unit_of_work, scope="function")
 ) -> UserProfileService:
-    return UserProfileService(user_repository)
\ No newline at end of file
+    return UserProfileService(user_repository, uow)
\ No newline at end of file
@@ -1,3 +1,5 @@
+import hashlib
+import uuid
 from datetime import UTC, datetime, timedelta
 from jose import JWTError, jwt
 from fastapi import Response
@@ -40,6 +42,7 @@ class JWTUtils:
         """Create a secure refresh token"""
         payload = {
             "sub": user_id,
+            "jti": uuid.uuid4().hex,    # keeps tokens issued in the same second distinct
             "iat": datetime.now(UTC),
             "exp": datetime.now(UTC) + timedelta(minutes=JWTUtils.REFRESH_TOKEN_EXPIRE_MINUTES)
         }
@@ -61,6 +64,11 @@ class JWTUtils:
         except JWTError:
             return False
 
+    @staticmethod
+    def hash_token(token: str) -> str:
+        """Fixed-width sha256 hex digest used to store and look up refresh tokens"""
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
     @staticmethod
     def get_refresh_token_expiry_time() -> datetime:
         """Get the expiry time of the refresh token"""
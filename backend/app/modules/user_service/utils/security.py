@@ -1,17 +1,262 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
 import bcrypt
+from app.config.settings import settings
+from app.config.metrics import Histogram
+from app.exceptions.exceptions import ServiceUnavailableException
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasher:
+    """
+    Hashes passwords with the configured algorithm and work factor.
+    Stored hashes are self-describing: bcrypt keeps its cost in `$2b$<cost>$`,
+    argon2id keeps its parameters in `$argon2id$v=19$m=<kib>,t=<time>,p=<lanes>$`.
+    Verification accepts either format, so switching algorithms only affects new hashes.
+    """
+
+    BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+    ARGON2_PREFIX = "$argon2id$"
+
+    def __init__(
+        self,
+        algorithm: str = "bcrypt",
+        bcrypt_rounds: int = 12,
+        argon2_time_cost: int = 3,
+        argon2_memory_kib: int = 65536,
+        argon2_parallelism: int = 1,
+    ) -> None:
+        if algorithm not in ("bcrypt", "argon2id"):
+            raise ValueError(f"Unsupported password hash algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.bcrypt_rounds = bcrypt_rounds
+        self.argon2_time_cost = argon2_time_cost
+        self.argon2_memory_kib = argon2_memory_kib
+        self.argon2_parallelism = argon2_parallelism
+        self._argon2 = None
+
+    def _argon2_hasher(self):
+        if self._argon2 is None:
+            try:
+                from argon2 import PasswordHasher as Argon2Hasher, Type
+            except ImportError as e:
+                raise RuntimeError("argon2id hashing requires the argon2-cffi package") from e
+            self._argon2 = Argon2Hasher(
+                time_cost=self.argon2_time_cost,
+                memory_cost=self.argon2_memory_kib,
+                parallelism=self.argon2_parallelism,
+                type=Type.ID,
+            )
+        return self._argon2
+
+    def hash(self, password: str) -> str:
+        if self.algorithm == "argon2id":
+            return self._argon2_hasher().hash(password)
+        # Encode the password to bytes and hash it
+        salt = bcrypt.gensalt(rounds=self.bcrypt_rounds)
+        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
+        # Return as string for database storage
+        return hashed.decode('utf-8')
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        if hashed_password.startswith(self.ARGON2_PREFIX):
+            from argon2.exceptions import InvalidHashError, VerificationError
+            try:
+                return self._argon2_hasher().verify(hashed_password, password)
+            except (VerificationError, InvalidHashError):
+                return False
+        try:
+            return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+        except ValueError:   # malformed hash
+            return False
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        True when a stored hash was made with another algorithm or with a work factor
+        below the current one. Stronger hashes are kept: rehashing them would weaken them.
+        """
+        if self.algorithm == "argon2id":
+            if not hashed_password.startswith(self.ARGON2_PREFIX):
+                return True
+            try:
+                params = dict(p.split("=") for p in hashed_password.split("$")[3].split(","))
+                time_cost, memory_kib = int(params["t"]), int(params["m"])
+            except (IndexError, KeyError, ValueError):
+                return True
+            return time_cost < self.argon2_time_cost or memory_kib < self.argon2_memory_kib
+
+        if not hashed_password.startswith(self.BCRYPT_PREFIXES):
+            return True
+        try:
+            rounds = int(hashed_password.split("$")[2])
+        except (IndexError, ValueError):
+            return True
+        return rounds < self.bcrypt_rounds
+
+    def calibrate(self, target_ms: float, max_cost: int) -> int:
+        """
+        Raise the work factor as far as `target_ms` per hash allows on this host, up to `max_cost`.
+        The configured cost is the floor: calibration never makes hashes weaker than it.
+        bcrypt cost is exponential (each step doubles), argon2 time cost is roughly linear.
+        Returns the chosen cost.
+        """
+        probe = "calibration-probe-password"
+        if self.algorithm == "argon2id":
+            floor = self.argon2_time_cost
+            elapsed_ms = self._measure(probe)
+            per_pass_ms = elapsed_ms / floor
+            cost = int(target_ms // per_pass_ms) if per_pass_ms else floor
+            self.argon2_time_cost = max(floor, min(max_cost, cost))
+            self._argon2 = None
+            return self.argon2_time_cost
+
+        floor = self.bcrypt_rounds
+        elapsed_ms = self._measure(probe)
+        steps = int(math.floor(math.log2(target_ms / elapsed_ms))) if elapsed_ms and target_ms > elapsed_ms else 0
+        self.bcrypt_rounds = max(floor, min(max_cost, floor + steps))
+        return self.bcrypt_rounds
+
+    def _measure(self, probe: str, samples: int = 3) -> float:
+        best = float("inf")
+        for _ in range(samples):
+            started_at = time.perf_counter()
+            self.hash(probe)
+            best = min(best, (time.perf_counter() - started_at) * 1000)
+        return best
+
+
+password_hasher = PasswordHasher(
+    algorithm=settings.password_hash_algorithm,
+    bcrypt_rounds=settings.password_hash_bcrypt_rounds,
+    argon2_time_cost=settings.password_hash_argon2_time_cost,
+    argon2_memory_kib=settings.password_hash_argon2_memory_kib,
+    argon2_parallelism=settings.password_hash_argon2_parallelism,
+)
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt"""
-    # Encode the password to bytes and hash it
-    password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    # Return as string for database storage
-    return hashed.decode('utf-8')
+    """Hash a password using the configured algorithm and cost"""
+    return password_hasher.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hashed password"""
-    password_bytes = plain_password.encode('utf-8')
-    hashed_bytes = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
+    return password_hasher.verify(plain_password, hashed_password)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check if a stored hash is off the current algorithm or cost"""
+    return password_hasher.needs_rehash(hashed_password)
+
+
+class PasswordHashPool:
+    """
+    Size-capped worker pool for password hashing.
+    bcrypt releases the GIL, so threads keep the event loop free while a hash runs.
+    Once `max_pending` jobs are queued or running, new jobs fail fast instead of piling up.
+    A job holds its slot until it finishes in the executor, not until its caller stops
+    waiting, so disconnecting clients cannot get past the cap.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending = 0
+        self._pending_lock = threading.Lock()   # slots are released from executor threads
+        self.rejected = 0
+        self.wait_time = Histogram()
+        self.run_time = Histogram()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hash",
+            )
+        return self._executor
+
+    async def run[R](self, func: Callable[..., R], *args: Any) -> R:
+        with self._pending_lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise ServiceUnavailableException("Too many password operations in progress, retry shortly")
+            self._pending += 1
+
+        submitted_at = time.perf_counter()
+        timings: list[float] = []
+
+        def job() -> R:
+            timings.append(time.perf_counter())
+            try:
+                return func(*args)
+            finally:
+                timings.append(time.perf_counter())
+
+        try:
+            future = self._get_executor().submit(job)
+        except BaseException:
+            self._release_slot()
+            raise
+        # runs when the job finishes, or is cancelled before it started
+        future.add_done_callback(self._release_slot)
+        try:
+            return await asyncio.wrap_future(future)
+        finally:
+            if len(timings) == 2:
+                started_at, finished_at = timings
+                self.wait_time.observe((started_at - submitted_at) * 1000)
+                self.run_time.observe((finished_at - started_at) * 1000)
+
+    def _release_slot(self, _future: Future | None = None) -> None:
+        with self._pending_lock:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "rejected": self.rejected,
+            "wait_time": self.wait_time.stats(),
+            "run_time": self.run_time.stats(),
+        }
+
+
+password_hash_pool = PasswordHashPool(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the password hash pool"""
+    return await password_hash_pool.run(get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password hash pool"""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+async def calibrate_password_hasher() -> None:
+    """Tune the work factor to `password_hash_target_ms` once at startup"""
+    if settings.password_hash_target_ms <= 0:
+        return
+    if password_hasher.algorithm == "argon2id":
+        max_cost = settings.password_hash_argon2_max_time_cost
+    else:
+        max_cost = settings.password_hash_bcrypt_max_rounds
+    cost = await password_hash_pool.run(password_hasher.calibrate, settings.password_hash_target_ms, max_cost)
+    logger.info(
+        f"Password hasher calibrated: {password_hasher.algorithm} cost={cost} "
+        f"target={settings.password_hash_target_ms}ms"
+    )
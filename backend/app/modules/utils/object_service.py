@@ -1,17 +1,22 @@
 import asyncio
 import logging
-from typing import Optional, AsyncIterator, List, AsyncGenerator
+from typing import TYPE_CHECKING, Optional, AsyncIterator, List, AsyncGenerator
 from functools import lru_cache
-import httpx
-from boto3 import client
-from botocore.config import Config
-from botocore.exceptions import ClientError
 from app.config.settings import settings
 
+if TYPE_CHECKING:
+    import httpx
+
 logger = logging.getLogger(__name__)
 
+# boto3/botocore and httpx take a few hundred ms to import between them and only
+# uploads need them, so they are imported on first use rather than at worker startup.
+
 @lru_cache
 def _get_s3_client():
+    from boto3 import client
+    from botocore.config import Config
+
     return client(
         "s3",
         region_name=settings.supabase_region,
@@ -33,10 +38,12 @@ class ObjectService:
     def __init__(self, bucket: str = "documents"):
         self.bucket = bucket
         self._s3 = _get_s3_client()
-        self._http: Optional[httpx.AsyncClient] = None
+        self._http: Optional["httpx.AsyncClient"] = None
 
     async def connect(self):
         if self._http is None:
+            import httpx
+
             self._http = httpx.AsyncClient(timeout=httpx.Timeout(30.0))
             logger.info("ObjectService connected")
 
@@ -152,6 +159,8 @@ class ObjectService:
             return False
 
     async def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
         try:
             await asyncio.to_thread(
                 self._s3.head_object,
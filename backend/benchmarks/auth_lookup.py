@@ -0,0 +1,85 @@
+"""
+Login-path user lookup: tracked User entity vs UserAuthRecord projection.
+
+    python -m benchmarks.auth_lookup --email someone@example.com
+
+Each call looks the user up and builds the response schema, as login does,
+on one open connection so session setup and pool checkout do not drown out
+the difference. Reports wall and CPU time per call and the memory each
+looked-up user keeps alive. Needs an existing user and the usual .env; run from backend/.
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import Any
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.db_connection import AsyncSessionLocal, engine
+from app.modules.user_service.models.session_model import Session  # noqa: F401  (registers the User.sessions target)
+from app.modules.user_service.repositories.user_repository import UserRepository
+from app.modules.user_service.schema.auth_schema import ReturnUserSchema
+
+
+async def lookup_entity(session: AsyncSession, email: str) -> Any:
+    user = await UserRepository(session).get_by_email(email)
+    ReturnUserSchema.model_validate(user)
+    session.expunge_all()   # a fresh request starts with an empty identity map
+    return user
+
+
+async def lookup_record(session: AsyncSession, email: str) -> Any:
+    user = await UserRepository(session).get_auth_record_by_email(email)
+    ReturnUserSchema.model_validate(user)
+    session.expunge_all()
+    return user
+
+
+async def time_calls(lookup, session: AsyncSession, email: str, number: int) -> tuple[float, float]:
+    """(wall us, CPU us) per call."""
+    wall_started_at, cpu_started_at = time.perf_counter(), time.process_time()
+    for _ in range(number):
+        await lookup(session, email)
+    wall_us = (time.perf_counter() - wall_started_at) / number * 1e6
+    cpu_us = (time.process_time() - cpu_started_at) / number * 1e6
+    return wall_us, cpu_us
+
+
+async def retained_bytes(lookup, session: AsyncSession, email: str, number: int) -> float:
+    """Memory each looked-up user keeps alive: the object plus, for entities, __dict__ and InstanceState."""
+    held = []
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for _ in range(number):
+        held.append(await lookup(session, email))
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return retained / number
+
+
+async def main(email: str, number: int, rounds: int = 5) -> None:
+    lookups = {"entity": lookup_entity, "record": lookup_record}
+    best: dict[str, tuple[float, float]] = {}
+    async with AsyncSessionLocal() as session:
+        for lookup in lookups.values():     # warm statement, compiled and prepared caches
+            for _ in range(50):
+                await lookup(session, email)
+        # alternate the two so drift on a busy machine hits both alike, keep the best round
+        for _ in range(rounds):
+            for name, lookup in lookups.items():
+                wall_us, cpu_us = await time_calls(lookup, session, email, number)
+                previous = best.get(name)
+                best[name] = (min(wall_us, previous[0]), min(cpu_us, previous[1])) if previous else (wall_us, cpu_us)
+
+        print(f"{'lookup':<10}{'wall us':>10}{'cpu us':>10}{'bytes/user':>12}")
+        for name, lookup in lookups.items():
+            held = await retained_bytes(lookup, session, email, number)
+            print(f"{name:<10}{best[name][0]:>10.1f}{best[name][1]:>10.1f}{held:>12.0f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--email", required=True, help="email of an existing user")
+    parser.add_argument("-n", "--number", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.email, args.number))
@@ -0,0 +1,101 @@
+"""
+Per-response CPU of the response envelopes: model_dump + JSONResponse vs pre-serialised bytes.
+
+    python -m benchmarks.envelope
+    python -m benchmarks.envelope --sessions 50
+
+Success payloads are shaped like the /auth/login and /sessions/ responses, errors
+like an expired-cookie 401 and a rejected login body. Both paths produce the
+full body bytes, which is what the route hands to the server.
+No database needed; run from backend/.
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from fastapi.responses import JSONResponse
+from app.advices.base_response import BaseResponse
+from app.advices.global_exception import INVALID_CREDENTIALS, REQUEST_VALIDATION_ERROR
+from app.advices.response import ApiErrorSchema, ErrorResponseSchema, SuccesResponseSchema
+from app.modules.user_service.schema.auth_schema import ReturnUserSchema, TokenResponseSchema
+from app.modules.user_service.schema.session_schema import SessionListSchema, SessionSchema
+
+
+def login_payload() -> TokenResponseSchema:
+    now = datetime.now(timezone.utc)
+    user = ReturnUserSchema(
+        id=uuid.uuid4(), name="John Doe", email="johndoe@example.com",
+        is_verified=True, created_at=now, updated_at=now,
+    )
+    return TokenResponseSchema(access_token="a" * 180, refresh_token="r" * 180, user=user)
+
+
+def sessions_payload(count: int) -> SessionListSchema:
+    now = datetime.now(timezone.utc)
+    sessions = [
+        SessionSchema(
+            id=uuid.uuid4(), user_agent="Mozilla/5.0 (X11; Linux x86_64) Firefox/128.0",
+            ip_address="203.0.113.7", expires_at=now + timedelta(days=7),
+            created_at=now, updated_at=now,
+        )
+        for _ in range(count)
+    ]
+    return SessionListSchema(sessions=sessions, total=count, total_strategy="exact", next_cursor="c" * 40)
+
+
+def dict_envelope(data) -> bytes:
+    # the previous succes_response: schema -> dict -> json.dumps
+    return JSONResponse(content=SuccesResponseSchema(data=data).model_dump(mode="json")).body
+
+
+def bytes_envelope(data) -> bytes:
+    return BaseResponse.succes_response(data=data).body
+
+
+def dict_error(error) -> bytes:
+    status_code, message, errors = error
+    api_error = ApiErrorSchema(status_code=status_code, message=message, errors=errors)
+    return JSONResponse(content=ErrorResponseSchema(api_error=api_error).model_dump(mode="json")).body
+
+
+def template_error(error) -> bytes:
+    _, _, errors = error
+    template = INVALID_CREDENTIALS if "detail" in errors else REQUEST_VALIDATION_ERROR
+    return template.response(errors).body
+
+
+def cpu_us(func, data, number: int) -> float:
+    """Best of 5 runs, CPU microseconds per response."""
+    best = float("inf")
+    for _ in range(5):
+        started_at = time.process_time()
+        for _ in range(number):
+            func(data)
+        best = min(best, time.process_time() - started_at)
+    return best / number * 1e6
+
+
+def compare(name: str, dict_path, bytes_path, data, number: int) -> None:
+    # both paths must produce the same document, timestamp aside
+    old, new = json.loads(dict_path(data)), json.loads(bytes_path(data))
+    assert {**old, "local_date_time": None} == {**new, "local_date_time": None}, name
+    dict_us, bytes_us = cpu_us(dict_path, data, number), cpu_us(bytes_path, data, number)
+    print(f"{name:<14}{dict_us:>10.1f}{bytes_us:>10.1f}{dict_us / bytes_us:>9.1f}x{len(bytes_path(data)):>10}")
+
+
+def main(number: int, session_count: int) -> None:
+    print(f"{'response':<14}{'dict us':>10}{'bytes us':>10}{'speedup':>10}{'body B':>10}")
+    compare("/auth/login", dict_envelope, bytes_envelope, login_payload(), number)
+    compare("/sessions/", dict_envelope, bytes_envelope, sessions_payload(session_count), number)
+    compare("401", dict_error, template_error, (401, "Invalid credentials provided", {"detail": "Token expired"}), number)
+    validation = {"email": "value is not a valid email address", "password": "String should have at least 6 characters"}
+    compare("422", dict_error, template_error, (422, "Validation Error", validation), number)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--number", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=20, help="sessions in the /sessions/ payload")
+    args = parser.parse_args()
+    main(args.number, args.sessions)
@@ -0,0 +1,83 @@
+"""
+Per-call cost of the hot repository statements: built on every call vs built once.
+
+    python -m benchmarks.hot_queries            # statement construction + cache key only
+    python -m benchmarks.hot_queries --db       # also execute against DATABASE_URL
+
+Run from backend/ with the usual .env in place.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from sqlalchemy import select
+from app.db.db_connection import AsyncSessionLocal, engine
+from app.modules.user_service.models.user_model import User
+from app.modules.user_service.models.session_model import Session
+from app.modules.user_service.repositories import session_repository, user_repository
+
+
+def per_call_us(func, number: int) -> float:
+    """Best of 5 runs, in microseconds per call."""
+    best = float("inf")
+    for _ in range(5):
+        started_at = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - started_at)
+    return best / number * 1e6
+
+
+def bench_construction(number: int) -> None:
+    # what SQLAlchemy does per execute before it can look up the compiled statement
+    cases = {
+        "get_by_email": (
+            lambda: select(User).where(User.email == "someone@example.com")._generate_cache_key(),
+            lambda: user_repository._select_by_email._generate_cache_key(),
+        ),
+        "get_by_refresh_token": (
+            lambda: select(Session).where(Session.refresh_token_hash == "0" * 64)._generate_cache_key(),
+            lambda: session_repository._select_by_refresh_token_hash._generate_cache_key(),
+        ),
+        "get_by_user_id": (
+            lambda: select(Session)
+            .where(Session.user_id == uuid.uuid4())
+            .order_by(Session.created_at.desc())
+            ._generate_cache_key(),
+            lambda: session_repository._select_by_user_id._generate_cache_key(),
+        ),
+    }
+    print(f"{'statement':<24}{'rebuilt us':>12}{'prebuilt us':>14}{'saved us':>12}")
+    for name, (rebuilt, prebuilt) in cases.items():
+        rebuilt_us, prebuilt_us = per_call_us(rebuilt, number), per_call_us(prebuilt, number)
+        print(f"{name:<24}{rebuilt_us:>12.2f}{prebuilt_us:>14.2f}{rebuilt_us - prebuilt_us:>12.2f}")
+
+
+async def bench_execution(number: int) -> None:
+    email = "benchmark-nobody@example.com"
+    async with AsyncSessionLocal() as session:
+        async def rebuilt() -> None:
+            await session.execute(select(User).where(User.email == email))
+
+        async def prebuilt() -> None:
+            await session.execute(user_repository._select_by_email, {"email": email})
+
+        print(f"\nget_by_email round trip, {number} calls on one connection")
+        for name, func in (("rebuilt", rebuilt), ("prebuilt", prebuilt)):
+            await func()    # warm the compiled and prepared statement caches
+            started_at = time.perf_counter()
+            for _ in range(number):
+                await func()
+            print(f"{name:<10}{(time.perf_counter() - started_at) / number * 1e6:>10.1f} us/call")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--number", type=int, default=5000)
+    parser.add_argument("--db", action="store_true", help="also time execution against the database")
+    args = parser.parse_args()
+
+    bench_construction(args.number)
+    if args.db:
+        asyncio.run(bench_execution(args.number // 5))
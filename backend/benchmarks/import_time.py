@@ -0,0 +1,97 @@
+"""
+Import cost of `main`, i.e. what every worker spawn and --reload pays before serving.
+
+    python -m benchmarks.import_time                    # per-module profile from -X importtime
+    python -m benchmarks.import_time --check            # fail if over budget or a lazy dependency loaded
+    python -m benchmarks.import_time --check --budget-ms 600
+    IMPORT_TIME_BUDGET_MS=3000 python -m benchmarks.import_time --check
+
+Each measurement imports main in a fresh interpreter. --check takes the best of
+several runs so a busy machine does not fail it, and exits 1 on a regression, for CI.
+Wall time depends on the machine, so slower runners set IMPORT_TIME_BUDGET_MS;
+the lazy-dependency check holds everywhere.
+Needs the usual .env (settings are read at import); run from backend/.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import Counter
+
+# Default budget for a cold `import main`, in milliseconds; IMPORT_TIME_BUDGET_MS overrides it
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", 1250))
+
+# Heavy top-level packages that must only be imported on first use, never by importing main
+LAZY_MODULES = (
+    "boto3", "botocore", "s3transfer", "httpx",
+    "polars", "pypdf", "langchain", "langchain_core", "langchain_text_splitter",
+)
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+MEASURE_SCRIPT = f"""
+import json, sys, time
+started_at = time.perf_counter()
+import main
+elapsed_ms = (time.perf_counter() - started_at) * 1000
+loaded = sorted({{name.partition(".")[0] for name in sys.modules}} & set({list(LAZY_MODULES)!r}))
+print(json.dumps({{"ms": elapsed_ms, "lazy_loaded": loaded}}))
+"""
+
+
+def profile(top: int) -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True, text=True, check=True,
+    )
+    modules: list[tuple[str, int, int]] = []      # (module, self us, cumulative us)
+    packages: Counter[str] = Counter()
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, name = int(match[1]), int(match[2]), match[4]
+            modules.append((name, self_us, cumulative_us))
+            packages[name.partition(".")[0]] += self_us
+
+    total_us = sum(packages.values())
+    print(f"import main: {total_us / 1000:.1f} ms across {len(modules)} modules\n")
+    print(f"{'package':<32}{'self ms':>10}{'share':>8}")
+    for package, self_us in packages.most_common(top):
+        print(f"{package:<32}{self_us / 1000:>10.1f}{self_us / total_us:>8.0%}")
+    print(f"\n{'module':<56}{'cumulative ms':>14}")
+    for name, _, cumulative_us in sorted(modules, key=lambda module: module[2], reverse=True)[:top]:
+        print(f"{name:<56}{cumulative_us / 1000:>14.1f}")
+
+
+def check(budget_ms: float, runs: int) -> int:
+    best_ms, lazy_loaded = float("inf"), []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", MEASURE_SCRIPT], capture_output=True, text=True, check=True)
+        measurement = json.loads(result.stdout.strip().splitlines()[-1])
+        best_ms = min(best_ms, measurement["ms"])
+        lazy_loaded = measurement["lazy_loaded"]
+
+    failed = False
+    print(f"import main: {best_ms:.1f} ms (best of {runs}), budget {budget_ms:.0f} ms")
+    if best_ms > budget_ms:
+        print("FAIL: over budget; run without --check to see which modules grew")
+        failed = True
+    if lazy_loaded:
+        print(f"FAIL: imported at startup but meant to load on first use: {', '.join(lazy_loaded)}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="enforce the budget instead of profiling")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS, help="default: $IMPORT_TIME_BUDGET_MS or 1250")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters measured by --check")
+    parser.add_argument("--top", type=int, default=20, help="rows shown by the profile")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(check(args.budget_ms, args.runs))
+    profile(args.top)
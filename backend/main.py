@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
@@ -7,9 +8,20 @@ from app.config.settings import settings
 from app.router import api_router
 from app.advices.global_exception import GlobalExceptionHandler
 from app.config.settings import settings
+from app.modules.user_service.utils.security import calibrate_password_hasher, password_hash_pool
+from app.middlewares.sql_instrumentation import SQLInstrumentationMiddleware
+from app.middlewares.compression import CompressionMiddleware
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    await calibrate_password_hasher()
+    yield
+    password_hash_pool.shutdown()
 
 
 app = FastAPI(
+    lifespan=lifespan,
     debug=settings.debug,
     title="Learn FastAPI",
     description="A simple project to learn FastAPI",
@@ -31,6 +43,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    SQLInstrumentationMiddleware,
+    sample_rate=settings.sql_instrumentation_sample_rate,
+    slowest_kept=settings.sql_slowest_statements,
+    n_plus_one_threshold=settings.sql_n_plus_one_threshold,
+)
+
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    level=settings.compression_level,
+    route_levels=settings.compression_route_levels,
+)
+
 app.include_router(api_router)
 GlobalExceptionHandler.register_exception_handlers(app)
 